@@ -1,12 +1,29 @@
 from __future__ import annotations
 
+import functools
 import logging
+import os
 import shutil
+import sys
 from datetime import datetime
 from pathlib import Path
 
 log = logging.getLogger(__name__)
 
+# Directives that resolve below one-minute precision; formats using them bypass the minute cache.
+_SUB_MINUTE_DIRECTIVES = ("%S", "%f", "%c", "%X", "%T", "%r", "%s")
+
+
+@functools.lru_cache(maxsize=32)
+def _format_subdir(subdir_format: str, year: int, month: int, day: int, hour: int, minute: int) -> str:
+    return datetime(year, month, day, hour, minute).strftime(subdir_format)
+
+
+def _subdir_for(subdir_format: str, now: datetime) -> str:
+    if now.tzinfo is not None or any(d in subdir_format for d in _SUB_MINUTE_DIRECTIVES):
+        return now.strftime(subdir_format)
+    return _format_subdir(subdir_format, now.year, now.month, now.day, now.hour, now.minute)
+
 
 def plan_archive_path(
     *,
@@ -19,26 +36,90 @@ def plan_archive_path(
     Returns the destination path under archive_root/subdir_format/, preserving filename.
     If a collision occurs, adds a numeric suffix.
     """
-    rel_dir = Path(now.strftime(subdir_format))
+    rel_dir = Path(_subdir_for(subdir_format, now))
     dest_dir = (archive_root / rel_dir).expanduser()
 
     dest = dest_dir / source_path.name
     if dest.exists():
+        # One directory listing instead of a stat() per probed suffix.
+        try:
+            with os.scandir(dest_dir) as it:
+                existing = {entry.name for entry in it}
+        except FileNotFoundError:
+            existing = set()
         stem = dest.stem
         suffix = dest.suffix
         for i in range(1, 1000):
-            candidate = dest_dir / f"{stem}__{i}{suffix}"
-            if not candidate.exists():
-                dest = candidate
+            name = f"{stem}__{i}{suffix}"
+            if name not in existing:
+                dest = dest_dir / name
                 break
     return dest
 
 
+# Linux `FICLONE` ioctl number (_IOW(0x94, 9, int)); supported by btrfs, XFS (reflink=1), bcachefs.
+_FICLONE = 0x40049409
+
+
+def _clone_linux(source_path: Path, dest_path: Path) -> bool:
+    import fcntl
+
+    with source_path.open("rb") as src:
+        try:
+            dst_fd = os.open(dest_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except OSError:
+            return False
+        try:
+            fcntl.ioctl(dst_fd, _FICLONE, src.fileno())
+        except OSError:
+            os.close(dst_fd)
+            dest_path.unlink(missing_ok=True)
+            return False
+        os.close(dst_fd)
+    shutil.copystat(source_path, dest_path)
+    return True
+
+
+def _clone_darwin(source_path: Path, dest_path: Path) -> bool:
+    import ctypes
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    clonefile = getattr(libc, "clonefile", None)
+    if clonefile is None:
+        return False
+    # int clonefile(const char *src, const char *dst, uint32_t flags)
+    clonefile.argtypes = (ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32)
+    clonefile.restype = ctypes.c_int
+    # clonefile(2) carries over mode, ownership and timestamps itself.
+    return clonefile(os.fsencode(source_path), os.fsencode(dest_path), 0) == 0
+
+
+def _try_clone(source_path: Path, dest_path: Path) -> bool:
+    """
+    Attempts a copy-on-write clone (APFS clonefile / Linux FICLONE) so archiving shares the
+    audio blocks instead of copying them. Returns False whenever the caller should copy instead.
+    """
+    try:
+        if os.stat(source_path).st_dev != os.stat(dest_path.parent).st_dev:
+            return False
+        if sys.platform == "darwin":
+            return _clone_darwin(source_path, dest_path)
+        if sys.platform.startswith("linux"):
+            return _clone_linux(source_path, dest_path)
+    except OSError:
+        return False
+    return False
+
+
 def ensure_archived_copy(*, source_path: Path, dest_path: Path) -> Path:
     dest_path.parent.mkdir(parents=True, exist_ok=True)
     if dest_path.exists():
         return dest_path
 
+    if _try_clone(source_path, dest_path):
+        log.info("Cloned audio to archive: %s -> %s", source_path, dest_path)
+        return dest_path
+
     log.info("Copying audio to archive: %s -> %s", source_path, dest_path)
     shutil.copy2(source_path, dest_path)
     return dest_path
@@ -1,40 +1,25 @@
 from __future__ import annotations
 
-import argparse
+import functools
 import logging
 import sys
 from datetime import datetime
 from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
 
-from voice2md.codex_runner import CodexError, build_referee_input, run_codex
 from voice2md.config import AppConfig, load_config
 from voice2md.logging_setup import setup_logging
-from voice2md.markdown import (
-    append_block,
-    extract_context,
-    extract_latest_sections,
-)
-from voice2md.pipeline import process_audio_file
-from voice2md.state import open_state_store
-from voice2md.watcher import Watcher
-
-log = logging.getLogger(__name__)
-
-_GLOBAL_FLAGS = {"-v", "--verbose"}
 
+if TYPE_CHECKING:
+    import argparse
 
-def _normalize_argv(argv: list[str]) -> list[str]:
-    """
-    Allow global flags (like --config / -v) to appear *after* the subcommand.
+log = logging.getLogger(__name__)
 
-    Argparse only treats options as "global" if they appear before the subcommand:
-      voice2md --config ~/.config/voice2md/config.yaml watch --once
+_GLOBAL_FLAGS = frozenset({"-v", "--verbose"})
 
-    Users commonly type:
-      voice2md watch --once --config ~/.config/voice2md/config.yaml
 
-    This function rewrites argv so both forms work.
-    """
+def _split_argv(argv: list[str]) -> tuple[list[str], list[str]]:
     global_parts: list[str] = []
     rest: list[str] = []
 
@@ -64,16 +49,35 @@ def _normalize_argv(argv: list[str]) -> list[str]:
         rest.append(arg)
         i += 1
 
+    return global_parts, rest
+
+
+def _normalize_argv(argv: list[str]) -> list[str]:
+    """
+    Allow global flags (like --config / -v) to appear *after* the subcommand.
+
+    Argparse only treats options as "global" if they appear before the subcommand:
+      voice2md --config ~/.config/voice2md/config.yaml watch --once
+
+    Users commonly type:
+      voice2md watch --once --config ~/.config/voice2md/config.yaml
+
+    This function rewrites argv so both forms work.
+    """
+    global_parts, rest = _split_argv(argv)
     return global_parts + rest
 
 
-def _load(cfg_path: str | None, *, verbose: bool) -> AppConfig:
+def _load(cfg_path: str | None, *, verbose: bool, with_logging: bool = True) -> AppConfig:
     cfg = load_config(Path(cfg_path).expanduser() if cfg_path else None)
-    setup_logging(cfg.paths.log_file, verbose=verbose)
+    if with_logging:
+        setup_logging(cfg.paths.log_file, verbose=verbose)
     return cfg
 
 
 def cmd_watch(args: argparse.Namespace) -> int:
+    from voice2md.watcher import Watcher
+
     cfg = _load(args.config, verbose=args.verbose)
     watcher = Watcher(cfg)
     try:
@@ -87,6 +91,9 @@ def cmd_watch(args: argparse.Namespace) -> int:
 
 
 def cmd_process(args: argparse.Namespace) -> int:
+    from voice2md.pipeline import process_audio_file
+    from voice2md.state import open_state_store
+
     cfg = _load(args.config, verbose=args.verbose)
     state = open_state_store(path=cfg.state.path, backend=cfg.state.backend)
     try:
@@ -99,7 +106,10 @@ def cmd_process(args: argparse.Namespace) -> int:
 
 
 def cmd_status(args: argparse.Namespace) -> int:
-    cfg = _load(args.config, verbose=args.verbose)
+    from voice2md.state import open_state_store
+
+    # Read-only report: don't create/open the log file just to print counts.
+    cfg = _load(args.config, verbose=args.verbose, with_logging=False)
     state = open_state_store(path=cfg.state.path, backend=cfg.state.backend)
     try:
         stats = state.stats()
@@ -110,6 +120,14 @@ def cmd_status(args: argparse.Namespace) -> int:
 
 
 def cmd_rerun_codex(args: argparse.Namespace) -> int:
+    from voice2md.codex_runner import CodexError, build_referee_input, run_codex
+    from voice2md.markdown import (
+        append_block,
+        extract_context,
+        extract_latest_sections,
+        has_commentary_header,
+    )
+
     cfg = _load(args.config, verbose=args.verbose)
     topic_file = Path(args.topic_file).expanduser().resolve()
 
@@ -143,7 +161,7 @@ def cmd_rerun_codex(args: argparse.Namespace) -> int:
     try:
         result = run_codex(cfg.codex, stdin_prompt=stdin_prompt)
         commentary = result.markdown.strip()
-        if not commentary.lstrip().startswith("## AI Commentary —"):
+        if not has_commentary_header(commentary):
             commentary = f"## AI Commentary — {today}\n\n{commentary}"
         append_block(topic_file, commentary, include_separator=True)
         return 0
@@ -152,35 +170,131 @@ def cmd_rerun_codex(args: argparse.Namespace) -> int:
         return 1
 
 
-def build_parser() -> argparse.ArgumentParser:
-    p = argparse.ArgumentParser(prog="voice2md")
-    p.add_argument("--config", help="Path to config.yaml (default: auto)")
-    p.add_argument("-v", "--verbose", action="store_true", help="Verbose logging")
-
-    sub = p.add_subparsers(dest="cmd", required=True)
-
+def _add_watch_parser(sub: argparse._SubParsersAction) -> None:
     w = sub.add_parser("watch", help="Watch inbox folder and process new audio")
     w.add_argument("--once", action="store_true", help="Process stable files once and exit")
     w.set_defaults(func=cmd_watch)
 
+
+def _add_process_parser(sub: argparse._SubParsersAction) -> None:
     pr = sub.add_parser("process", help="Process a single audio file")
     pr.add_argument("file", help="Path to audio file")
     pr.add_argument("--force", action="store_true", help="Reprocess even if already processed")
     pr.set_defaults(func=cmd_process)
 
+
+def _add_status_parser(sub: argparse._SubParsersAction) -> None:
     st = sub.add_parser("status", help="Show ledger counts")
     st.set_defaults(func=cmd_status)
 
+
+def _add_rerun_codex_parser(sub: argparse._SubParsersAction) -> None:
     rc = sub.add_parser("rerun-codex", help="Append Codex commentary for the latest voice dump")
     rc.add_argument("topic_file", help="Path to a topic markdown file")
     rc.add_argument("--force", action="store_true", help="Append even if latest already has commentary")
     rc.set_defaults(func=cmd_rerun_codex)
 
+
+_SUBCOMMANDS = {
+    "watch": _add_watch_parser,
+    "process": _add_process_parser,
+    "status": _add_status_parser,
+    "rerun-codex": _add_rerun_codex_parser,
+}
+
+
+def _root_parser() -> tuple[argparse.ArgumentParser, argparse._SubParsersAction]:
+    import argparse
+
+    p = argparse.ArgumentParser(prog="voice2md")
+    p.add_argument("--config", help="Path to config.yaml (default: auto)")
+    p.add_argument("-v", "--verbose", action="store_true", help="Verbose logging")
+
+    sub = p.add_subparsers(dest="cmd", required=True)
+    return p, sub
+
+
+# Parsers are built once per process and reused. `parse_args` leaves them unchanged, and callers
+# must not modify the returned parser either.
+@functools.lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
+    p, sub = _root_parser()
+    for add in _SUBCOMMANDS.values():
+        add(sub)
+    return p
+
+
+@functools.lru_cache(maxsize=len(_SUBCOMMANDS))
+def build_parser_for(cmd: str) -> argparse.ArgumentParser:
+    """
+    Builds the root parser with only the `cmd` subcommand registered.
+
+    Used when argv already names a known subcommand; help/usage errors go through `build_parser()`
+    so they can list every subcommand.
+    """
+    p, sub = _root_parser()
+    _SUBCOMMANDS[cmd](sub)
     return p
 
 
+# cmd -> (boolean flags, positional arg name or None, handler); mirrors the argparse definitions above.
+_FAST_COMMANDS = {
+    "watch": (("--once",), None, cmd_watch),
+    "process": (("--force",), "file", cmd_process),
+    "status": ((), None, cmd_status),
+    "rerun-codex": (("--force",), "topic_file", cmd_rerun_codex),
+}
+
+
+def _fast_parse(argv: list[str]) -> SimpleNamespace | None:
+    """
+    Parses the common, well-formed invocations without importing or building argparse.
+
+    Returns None for anything else (help, unknown/abbreviated options, missing or extra
+    positionals) so the caller can fall back to argparse for its usual handling and errors.
+    """
+    global_parts, rest = _split_argv(argv)
+    if not rest or rest[0] not in _FAST_COMMANDS:
+        return None
+
+    values: dict[str, object] = {"config": None, "verbose": False}
+    i = 0
+    while i < len(global_parts):
+        arg = global_parts[i]
+        if arg in _GLOBAL_FLAGS:
+            values["verbose"] = True
+        elif arg == "--config":
+            if i + 1 >= len(global_parts) or global_parts[i + 1].startswith("-"):
+                return None
+            values["config"] = global_parts[i + 1]
+            i += 1
+        else:
+            values["config"] = arg.partition("=")[2]
+        i += 1
+
+    cmd = rest[0]
+    flags, positional, func = _FAST_COMMANDS[cmd]
+    for flag in flags:
+        values[flag.lstrip("-")] = False
+    for arg in rest[1:]:
+        if arg in flags:
+            values[arg.lstrip("-")] = True
+        elif arg.startswith("-") or positional is None or positional in values:
+            return None
+        else:
+            values[positional] = arg
+    if positional is not None and positional not in values:
+        return None
+
+    return SimpleNamespace(cmd=cmd, func=func, **values)
+
+
 def main(argv: list[str] | None = None) -> int:
-    parser = build_parser()
     raw = list(sys.argv[1:] if argv is None else argv)
-    args = parser.parse_args(_normalize_argv(raw))
+    args = _fast_parse(raw)
+    if args is None:
+        global_parts, rest = _split_argv(raw)
+        cmd = rest[0] if rest else None
+        parser = build_parser_for(cmd) if cmd in _SUBCOMMANDS else build_parser()
+        args = parser.parse_args(global_parts + rest)
     return int(args.func(args))
@@ -21,11 +21,21 @@ class CodexResult:
     markdown: str
 
 
+# path -> (mtime_ns, size, stripped text); edits to the prompt file invalidate the entry.
+_PROMPT_CACHE: dict[Path, tuple[int, int, str]] = {}
+
+
 def _load_prompt_template(path: Path) -> str:
     try:
-        return path.read_text(encoding="utf-8").strip()
+        st = path.stat()
+        cached = _PROMPT_CACHE.get(path)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        text = path.read_text(encoding="utf-8").strip()
     except FileNotFoundError as e:
         raise CodexError(f"Prompt file not found: {path}") from e
+    _PROMPT_CACHE[path] = (st.st_mtime_ns, st.st_size, text)
+    return text
 
 
 def build_referee_input(
@@ -36,72 +46,65 @@ def build_referee_input(
     latest_voice_dump_markdown: str,
 ) -> str:
     template = _load_prompt_template(prompt_template_path)
-    parts: list[str] = [
-        f"Today is {today}.",
-        "",
-        template,
-    ]
-    if notebook_context_markdown.strip():
-        parts += [
+    context = notebook_context_markdown.strip()
+    context_parts = (
+        ("", "---", "## Context From Notebook (most recent sections)", context) if context else ()
+    )
+    return "\n".join(
+        (
+            f"Today is {today}.",
+            "",
+            template,
+            *context_parts,
             "",
             "---",
-            "## Context From Notebook (most recent sections)",
-            notebook_context_markdown.strip(),
-        ]
-    parts += [
-        "",
-        "---",
-        "## Latest Voice Dump (critique this)",
-        latest_voice_dump_markdown.strip(),
-        "",
-    ]
-    return "\n".join(parts)
-
-
-def _ensure_output_last_message(cmd: list[str], output_path: Path) -> list[str]:
-    if any(part in {"-o", "--output-last-message"} for part in cmd):
-        return cmd
-
-    # Inject before prompt argument (`-`) if present.
-    try:
-        idx = cmd.index("-")
-    except ValueError:
-        cmd = cmd + ["-"]
-        idx = len(cmd) - 1
+            "## Latest Voice Dump (critique this)",
+            latest_voice_dump_markdown.strip(),
+            "",
+        )
+    )
 
-    return cmd[:idx] + ["--output-last-message", str(output_path)] + cmd[idx:]
 
+def _prepare_codex_argv(
+    cmd: list[str],
+    *,
+    output_path: Path,
+    model: str,
+    reasoning_effort: str,
+) -> list[str]:
+    """
+    Inserts `--output-last-message`, `--model` and the reasoning-effort override before the prompt
+    argument (`-`), skipping any the user already supplied. Scans `cmd` once and builds argv once.
+    """
+    has_output = has_model = has_effort = False
+    for part in cmd:
+        if part in {"-o", "--output-last-message"}:
+            has_output = True
+        elif part in {"-m", "--model"}:
+            has_model = True
+        if "model_reasoning_effort" in part:
+            has_effort = True
 
-def _inject_model(cmd: list[str], model: str) -> list[str]:
+    inserts: list[str] = []
+    if not has_output:
+        inserts += ["--output-last-message", str(output_path)]
     model = model.strip()
-    if not model:
-        return cmd
-    if any(part in {"-m", "--model"} for part in cmd):
-        return cmd
-    try:
-        idx = cmd.index("-")
-    except ValueError:
-        idx = len(cmd)
-    return cmd[:idx] + ["--model", model] + cmd[idx:]
-
-
-def _inject_reasoning_effort(cmd: list[str], reasoning_effort: str) -> list[str]:
+    if model and not has_model:
+        inserts += ["--model", model]
     reasoning_effort = reasoning_effort.strip()
-    if not reasoning_effort:
-        return cmd
-
-    # If the user already supplied a config override for this, respect it.
-    for part in cmd:
-        if "model_reasoning_effort" in part:
-            return cmd
+    if reasoning_effort and not has_effort:
+        # Codex CLI parses the value as TOML, so we must quote the string.
+        inserts += ["-c", f'model_reasoning_effort="{reasoning_effort}"']
 
     try:
         idx = cmd.index("-")
     except ValueError:
-        idx = len(cmd)
+        if has_output:
+            return cmd + inserts
+        # The output file needs a prompt argument to sit in front of.
+        return cmd + inserts + ["-"]
 
-    # Codex CLI parses the value as TOML, so we must quote the string.
-    return cmd[:idx] + ["-c", f'model_reasoning_effort="{reasoning_effort}"'] + cmd[idx:]
+    return cmd[:idx] + inserts + cmd[idx:]
 
 
 def _inject_web_search(cmd: list[str], enabled: bool) -> list[str]:
@@ -122,6 +125,13 @@ def _inject_web_search(cmd: list[str], enabled: bool) -> list[str]:
     return cmd
 
 
+def _read_last_message(out_path: Path) -> str:
+    try:
+        return out_path.read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return ""
+
+
 def run_codex(cfg: CodexConfig, *, stdin_prompt: str) -> CodexResult:
     if not cfg.enabled:
         raise CodexError("Codex is disabled in config")
@@ -135,46 +145,62 @@ def run_codex(cfg: CodexConfig, *, stdin_prompt: str) -> CodexResult:
     with tempfile.TemporaryDirectory(prefix="voice2md_codex_") as tmp:
         out_path = Path(tmp) / "codex_last_message.txt"
         cmd = _inject_web_search(base_cmd, cfg.web_search_enabled)
-        cmd = _ensure_output_last_message(cmd, out_path)
-        cmd = _inject_model(cmd, cfg.model)
-        cmd = _inject_reasoning_effort(cmd, cfg.model_reasoning_effort)
+        cmd = _prepare_codex_argv(
+            cmd,
+            output_path=out_path,
+            model=cfg.model,
+            reasoning_effort=cfg.model_reasoning_effort,
+        )
+
+        # Encode once up front and talk to the pipes in binary; text mode would re-encode the
+        # whole prompt through a TextIOWrapper.
+        payload = stdin_prompt.encode("utf-8")
 
         log.info("Running Codex: %s", " ".join(cmd))
         try:
-            subprocess.run(
+            proc = subprocess.Popen(
                 cmd,
-                input=stdin_prompt,
-                text=True,
-                capture_output=True,
-                timeout=cfg.timeout_seconds,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 env=env,
-                check=True,
             )
         except FileNotFoundError as e:
             raise CodexError(f"Codex command not found: {cmd[0]}") from e
-        except subprocess.TimeoutExpired as e:
-            if out_path.exists():
-                text = out_path.read_text(encoding="utf-8").strip()
+
+        # As in `subprocess.run`: the child is killed and reaped on any exception (Ctrl-C included),
+        # and the context manager closes the pipes.
+        with proc:
+            try:
+                stdout, stderr = proc.communicate(payload, timeout=cfg.timeout_seconds)
+            except subprocess.TimeoutExpired as e:
+                proc.kill()
+                proc.communicate()
+                text = _read_last_message(out_path)
                 if text:
                     log.warning(
                         "Codex timed out after %ss but produced an output file; using partial output",
                         cfg.timeout_seconds,
                     )
                     return CodexResult(markdown=text)
-            raise CodexError(
-                f"Codex timed out after {cfg.timeout_seconds}s "
-                f"(increase codex.timeout_seconds in config.yaml)"
-            ) from e
-        except subprocess.CalledProcessError as e:
-            stderr = (e.stderr or "").strip()
-            stdout = (e.stdout or "").strip()
-            detail = stderr or stdout or f"exit {e.returncode}"
-            raise CodexError(f"Codex failed: {detail}") from e
-
-        if out_path.exists():
-            text = out_path.read_text(encoding="utf-8").strip()
-        else:
-            text = ""
+                raise CodexError(
+                    f"Codex timed out after {cfg.timeout_seconds}s "
+                    f"(increase codex.timeout_seconds in config.yaml)"
+                ) from e
+            except BaseException:
+                proc.kill()
+                proc.wait()
+                raise
+
+        if proc.returncode != 0:
+            detail = (
+                stderr.decode("utf-8", errors="replace").strip()
+                or stdout.decode("utf-8", errors="replace").strip()
+                or f"exit {proc.returncode}"
+            )
+            raise CodexError(f"Codex failed: {detail}")
+
+        text = _read_last_message(out_path)
         if not text:
             raise CodexError("Codex produced no output (empty last message)")
         return CodexResult(markdown=text)
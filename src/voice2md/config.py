@@ -1,19 +1,29 @@
 from __future__ import annotations
 
+import functools
+import json
 import os
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, TypeVar
+
+_T = TypeVar("_T")
 
 
 class ConfigError(RuntimeError):
     pass
 
 
-def _load_yaml(path: Path) -> dict[str, Any]:
-    if not path.exists():
-        raise ConfigError(f"Config not found: {path}")
+def _parse_yaml(path: Path) -> dict[str, Any]:
+    raw = path.read_bytes()
+    # An empty config means "all defaults"; don't spin up the YAML scanner for it.
+    if not raw.strip():
+        return {}
 
+    # Imported here rather than at module load: warm starts served from the JSON cache (or an
+    # empty config) never pay for importing PyYAML.
     try:
         import yaml  # type: ignore[import-not-found]
     except ImportError as e:
@@ -21,8 +31,12 @@ def _load_yaml(path: Path) -> dict[str, Any]:
             "PyYAML is required to parse config.yaml. Install it with: pip install pyyaml"
         ) from e
 
+    # Prefer the libyaml-backed loader; fall back to the pure-Python one if PyYAML was built without it.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
     try:
-        parsed = yaml.safe_load(path.read_text(encoding="utf-8"))
+        # Hand libyaml the raw bytes: it detects the encoding and decodes in C, so we skip
+        # building an intermediate str of the whole file.
+        parsed = yaml.load(raw, Loader=loader)
     except Exception as e:
         raise ConfigError(f"Invalid YAML in {path}: {e}") from e
 
@@ -33,20 +47,97 @@ def _load_yaml(path: Path) -> dict[str, Any]:
     return parsed
 
 
-def _deep_merge(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
+def _json_cache_path(path: Path) -> Path:
+    return path.with_suffix(path.suffix + ".jsoncache")
+
+
+def _read_json_cache(path: Path, source: tuple[int, int]) -> dict[str, Any] | None:
+    try:
+        cached = json.loads(_json_cache_path(path).read_bytes())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("source") != list(source):
+        return None
+    data = cached.get("data")
+    return data if isinstance(data, dict) else None
+
+
+def _write_json_cache(path: Path, source: tuple[int, int], data: dict[str, Any]) -> None:
+    cache = _json_cache_path(path)
+    tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+    try:
+        payload = json.dumps({"source": list(source), "data": data}, default=str)
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, cache)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def _load_yaml(path: Path, source: tuple[int, int] | None = None) -> dict[str, Any]:
+    # `source` is the file's (mtime_ns, size) when the caller has already stat'ed it.
+    if source is None:
+        try:
+            st = path.stat()
+        except FileNotFoundError as e:
+            raise ConfigError(f"Config not found: {path}") from e
+        source = (st.st_mtime_ns, st.st_size)
+
+    # Opt-in: reuse a JSON copy of the parsed YAML (stored next to the config and keyed by the
+    # YAML file's mtime/size) so warm starts skip the YAML parser entirely.
+    use_cache = os.environ.get("VOICE2MD_CONFIG_CACHE") == "1"
+    if use_cache:
+        cached = _read_json_cache(path, source)
+        if cached is not None:
+            return cached
+
+    parsed = _parse_yaml(path)
+    if use_cache:
+        _write_json_cache(path, source, parsed)
+    return parsed
+
+
+def _overlay(base: Mapping[str, Any], override: dict[str, Any]) -> Mapping[str, Any]:
+    """
+    Layers `override` on top of `base`, copying only the branches that `override` touches.
+    Untouched subtrees are shared with `base` (which is expected to be read-only).
+    """
+    if not override:
+        return base
     out = dict(base)
-    for k, v in override.items():
-        if isinstance(v, dict) and isinstance(out.get(k), dict):
-            out[k] = _deep_merge(out[k], v)  # type: ignore[arg-type]
-        else:
-            out[k] = v
+    stack = [(out, override)]
+    while stack:
+        dst, src = stack.pop()
+        for k, v in src.items():
+            prev = dst.get(k)
+            if isinstance(v, dict) and isinstance(prev, Mapping):
+                child = dict(prev)
+                dst[k] = child
+                stack.append((child, v))
+            else:
+                dst[k] = v
     return out
 
 
-def _expand_path(value: str | None) -> Path | None:
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _expand_path(value: str | None, home: str | None = None) -> Path | None:
     if value is None:
         return None
-    return Path(os.path.expandvars(value)).expanduser()
+    # Most configured paths are literal; only pay for expandvars/expanduser when they could apply.
+    if "$" in value:
+        value = os.path.expandvars(value)
+    if value.startswith("~"):
+        # `home` lets a caller expanding several paths look up the home directory only once.
+        if home is not None and (value == "~" or value.startswith("~/")):
+            return Path(home + value[1:])
+        return Path(value).expanduser()
+    return Path(value)
 
 
 @dataclass(frozen=True)
@@ -86,6 +177,7 @@ class WhisperCppConfig:
     language: str
     threads: int
     extra_args: tuple[str, ...]
+    pipe_audio: bool = False
 
 
 @dataclass(frozen=True)
@@ -95,6 +187,8 @@ class FasterWhisperConfig:
     compute_type: str
     language: str
     beam_size: int
+    vad_filter: bool = True
+    fast_mode: bool = False
 
 
 @dataclass(frozen=True)
@@ -136,7 +230,7 @@ class AppConfig:
     config_path: Path
 
 
-DEFAULT_CONFIG: dict[str, Any] = {
+DEFAULT_CONFIG: Mapping[str, Any] = _freeze({
     "paths": {
         "inbox_audio_dir": "~/VoiceInbox",
         "obsidian_vault_dir": "~/ObsidianVault",
@@ -161,13 +255,16 @@ DEFAULT_CONFIG: dict[str, Any] = {
             "language": "auto",
             "threads": 6,
             "extra_args": [],
+            "pipe_audio": False,
         },
         "faster_whisper": {
             "model": "medium",
             "device": "auto",
-            "compute_type": "int8",
+            "compute_type": "auto",
             "language": "auto",
             "beam_size": 5,
+            "vad_filter": True,
+            "fast_mode": False,
         },
     },
     "routing": {"infer_topic_max_words": 6, "infer_topic_max_chars": 80},
@@ -183,10 +280,90 @@ DEFAULT_CONFIG: dict[str, Any] = {
         "context_ai_commentaries": 1,
         "context_max_chars": 20000,
     },
-}
-
-
+})
+
+
+def _small_str(value: Any) -> str:
+    # Enum-like settings (engine, backend, device, ...) come from a tiny vocabulary; interning
+    # makes later equality checks against literals an identity hit.
+    return sys.intern(str(value))
+
+
+# Per-section field schemas: (field name, cast). `Path` marks fields that get env/~ expansion.
+_FieldSchema = tuple[tuple[str, Callable[[Any], Any]], ...]
+
+_PATHS_FIELDS: _FieldSchema = (
+    ("inbox_audio_dir", Path),
+    ("obsidian_vault_dir", Path),
+    ("topics_dir", Path),
+    ("archive_audio_dir", Path),
+    ("log_file", Path),
+)
+_AUDIO_FIELDS: _FieldSchema = (
+    ("archive_copy_enabled", bool),
+    ("delete_original_after_archive", bool),
+)
+_PROCESSING_FIELDS: _FieldSchema = (
+    ("allowed_extensions", tuple),
+    ("stable_seconds", int),
+    ("poll_interval_seconds", int),
+    ("in_progress_ttl_seconds", int),
+    ("archive_subdir_format", str),
+)
+_WHISPER_CPP_FIELDS: _FieldSchema = (
+    ("binary", str),
+    ("model_path", Path),
+    ("language", _small_str),
+    ("threads", int),
+    ("extra_args", tuple),
+    ("pipe_audio", bool),
+)
+_FASTER_WHISPER_FIELDS: _FieldSchema = (
+    ("model", str),
+    ("device", _small_str),
+    ("compute_type", _small_str),
+    ("language", _small_str),
+    ("beam_size", int),
+    ("vad_filter", bool),
+    ("fast_mode", bool),
+)
+_ROUTING_FIELDS: _FieldSchema = (
+    ("infer_topic_max_words", int),
+    ("infer_topic_max_chars", int),
+)
+# `prompt_file` is resolved relative to the config file and passed separately.
+_CODEX_FIELDS: _FieldSchema = (
+    ("enabled", bool),
+    ("command", tuple),
+    ("model", str),
+    ("model_reasoning_effort", str),
+    ("web_search_enabled", bool),
+    ("timeout_seconds", int),
+    ("context_voice_dumps", int),
+    ("context_ai_commentaries", int),
+    ("context_max_chars", int),
+)
+
+
+def _materialize(
+    cls: type[_T],
+    fields: _FieldSchema,
+    section: Mapping[str, Any],
+    defaults: Mapping[str, Any],
+    home: str,
+    **extra: Any,
+) -> _T:
+    kwargs = dict(extra)
+    for name, cast in fields:
+        raw = section.get(name, defaults[name])
+        kwargs[name] = _expand_path(str(raw), home) if cast is Path else cast(raw)
+    return cls(**kwargs)
+
+
+@functools.cache
 def default_config_path() -> Path:
+    # Resolved once per process; call `default_config_path.cache_clear()` after changing
+    # VOICE2MD_CONFIG or the working directory.
     env = os.environ.get("VOICE2MD_CONFIG")
     if env:
         return Path(env).expanduser()
@@ -200,92 +377,98 @@ def default_config_path() -> Path:
 
 def load_config(path: Path | None = None) -> AppConfig:
     config_path = (path or default_config_path()).expanduser()
-    data = _load_yaml(config_path)
-    merged = _deep_merge(DEFAULT_CONFIG, data)
+    try:
+        st = config_path.stat()
+    except FileNotFoundError as e:
+        raise ConfigError(f"Config not found: {config_path}") from e
+    return _load_config_cached(config_path, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(config_path: Path, mtime_ns: int, size: int) -> AppConfig:
+    # Keyed on (mtime_ns, size) so an edited config is re-read; AppConfig is frozen, so
+    # handing the same instance to every caller is safe.
+    return _build_config(config_path, source=(mtime_ns, size))
+
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
 
-    user_paths = data.get("paths", {}) if isinstance(data.get("paths", {}), dict) else {}
-    user_state = data.get("state") if isinstance(data.get("state"), dict) else None
+def _mapping(section: Mapping[str, Any], key: str) -> Mapping[str, Any]:
+    # One lookup per section; anything that isn't a mapping (e.g. a bare `paths:`) counts as empty.
+    value = section.get(key)
+    return value if isinstance(value, Mapping) else _EMPTY
 
-    paths = merged.get("paths", {})
-    state = merged.get("state", {})
-    audio = merged.get("audio", {})
-    processing = merged.get("processing", {})
-    transcription = merged.get("transcription", {})
-    routing = merged.get("routing", {})
-    codex = merged.get("codex", {})
+
+def _build_config(config_path: Path, *, source: tuple[int, int] | None = None) -> AppConfig:
+    data = _load_yaml(config_path, source)
+    merged = _overlay(DEFAULT_CONFIG, data)
+
+    user_paths = _mapping(data, "paths")
+    has_user_state = isinstance(data.get("state"), dict)
+
+    paths = _mapping(merged, "paths")
+    state = _mapping(merged, "state")
+    audio = _mapping(merged, "audio")
+    processing = _mapping(merged, "processing")
+    transcription = _mapping(merged, "transcription")
+    routing = _mapping(merged, "routing")
+    codex = _mapping(merged, "codex")
 
     prompt_path = codex.get("prompt_file", DEFAULT_CONFIG["codex"]["prompt_file"])
     prompt_path = Path(prompt_path) if isinstance(prompt_path, str) else Path(str(prompt_path))
     if not prompt_path.is_absolute():
         prompt_path = (config_path.parent / prompt_path).resolve()
 
-    whisper_cpp = transcription.get("whisper_cpp", {})
-    faster_whisper = transcription.get("faster_whisper", {})
+    whisper_cpp = _mapping(transcription, "whisper_cpp")
+    faster_whisper = _mapping(transcription, "faster_whisper")
+
+    home = os.path.expanduser("~")
 
     # Backward compatibility: older configs used `paths.state_db_path` for sqlite, and had no `state:` section.
     legacy_state_db_path = user_paths.get("state_db_path")
-    if user_state is None and legacy_state_db_path:
+    if not has_user_state and legacy_state_db_path:
         state_backend = "sqlite"
         state_path_raw = legacy_state_db_path
     else:
-        state_backend = str(state.get("backend", DEFAULT_CONFIG["state"]["backend"])).strip().lower()
+        state_backend = _small_str(str(state.get("backend", DEFAULT_CONFIG["state"]["backend"])).strip().lower())
         state_path_raw = state.get("path", DEFAULT_CONFIG["state"]["path"])
 
     return AppConfig(
-        paths=PathsConfig(
-            inbox_audio_dir=_expand_path(str(paths["inbox_audio_dir"])) or Path(),
-            obsidian_vault_dir=_expand_path(str(paths["obsidian_vault_dir"])) or Path(),
-            topics_dir=_expand_path(str(paths["topics_dir"])) or Path(),
-            archive_audio_dir=_expand_path(str(paths["archive_audio_dir"])) or Path(),
-            log_file=_expand_path(str(paths["log_file"])) or Path(),
-        ),
+        paths=_materialize(PathsConfig, _PATHS_FIELDS, paths, DEFAULT_CONFIG["paths"], home),
         state=StateConfig(
             backend=state_backend,
-            path=_expand_path(str(state_path_raw)) or Path(),
-        ),
-        audio=AudioConfig(
-            archive_copy_enabled=bool(audio.get("archive_copy_enabled", False)),
-            delete_original_after_archive=bool(audio.get("delete_original_after_archive", False)),
+            path=_expand_path(str(state_path_raw), home) or Path(),
         ),
-        processing=ProcessingConfig(
-            allowed_extensions=tuple(processing.get("allowed_extensions", [])),
-            stable_seconds=int(processing.get("stable_seconds", 10)),
-            poll_interval_seconds=int(processing.get("poll_interval_seconds", 5)),
-            in_progress_ttl_seconds=int(processing.get("in_progress_ttl_seconds", 3600)),
-            archive_subdir_format=str(processing.get("archive_subdir_format", "%Y/%m")),
+        audio=_materialize(AudioConfig, _AUDIO_FIELDS, audio, DEFAULT_CONFIG["audio"], home),
+        processing=_materialize(
+            ProcessingConfig, _PROCESSING_FIELDS, processing, DEFAULT_CONFIG["processing"], home
         ),
         transcription=TranscriptionConfig(
-            engine=str(transcription.get("engine", "whisper_cpp")),
-            whisper_cpp=WhisperCppConfig(
-                binary=str(whisper_cpp.get("binary", "whisper-cli")),
-                model_path=_expand_path(str(whisper_cpp.get("model_path", ""))) or Path(),
-                language=str(whisper_cpp.get("language", "auto")),
-                threads=int(whisper_cpp.get("threads", 6)),
-                extra_args=tuple(whisper_cpp.get("extra_args", [])),
+            engine=_small_str(transcription.get("engine", "whisper_cpp")),
+            whisper_cpp=_materialize(
+                WhisperCppConfig,
+                _WHISPER_CPP_FIELDS,
+                whisper_cpp,
+                DEFAULT_CONFIG["transcription"]["whisper_cpp"],
+                home,
             ),
-            faster_whisper=FasterWhisperConfig(
-                model=str(faster_whisper.get("model", "medium")),
-                device=str(faster_whisper.get("device", "auto")),
-                compute_type=str(faster_whisper.get("compute_type", "int8")),
-                language=str(faster_whisper.get("language", "auto")),
-                beam_size=int(faster_whisper.get("beam_size", 5)),
+            faster_whisper=_materialize(
+                FasterWhisperConfig,
+                _FASTER_WHISPER_FIELDS,
+                faster_whisper,
+                DEFAULT_CONFIG["transcription"]["faster_whisper"],
+                home,
             ),
         ),
-        routing=RoutingConfig(
-            infer_topic_max_words=int(routing.get("infer_topic_max_words", 6)),
-            infer_topic_max_chars=int(routing.get("infer_topic_max_chars", 80)),
-        ),
-        codex=CodexConfig(
-            enabled=bool(codex.get("enabled", True)),
-            command=tuple(codex.get("command", [])),
-            model=str(codex.get("model", "")),
-            model_reasoning_effort=str(codex.get("model_reasoning_effort", "")),
-            web_search_enabled=bool(codex.get("web_search_enabled", False)),
-            timeout_seconds=int(codex.get("timeout_seconds", 180)),
+        routing=_materialize(RoutingConfig, _ROUTING_FIELDS, routing, DEFAULT_CONFIG["routing"], home),
+        codex=_materialize(
+            CodexConfig,
+            _CODEX_FIELDS,
+            codex,
+            DEFAULT_CONFIG["codex"],
+            home,
             prompt_file=prompt_path,
-            context_voice_dumps=int(codex.get("context_voice_dumps", 3)),
-            context_ai_commentaries=int(codex.get("context_ai_commentaries", 1)),
-            context_max_chars=int(codex.get("context_max_chars", 20000)),
         ),
         config_path=config_path,
     )
@@ -1,19 +1,35 @@
 from __future__ import annotations
 
+import functools
+import mmap
+import os
 import re
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
 
 _SECTION_RE = re.compile(r"(?m)^## (Voice Dump|AI Commentary) — .*$")
+_COMMENTARY_HEADER_RE = re.compile(r"\s*## AI Commentary —")
+
+_SLASHES_RE = re.compile(r"[\\/]+")
+_WS_RE = re.compile(r"\s+")
+_TRAILING_BLANKS_RE = re.compile(r"[ \t]+\n")
+_EXTRA_NEWLINES_RE = re.compile(r"\n{3,}")
+# Characters dropped from topic filenames, deleted in one C-level pass.
+_UNSAFE_FILENAME_CHARS = str.maketrans("", "", ':*?"<>|')
+
+# First window `extract_context` reads from the end of a notebook; doubled until it holds enough.
+_TAIL_WINDOW_BYTES = 32 * 1024
 
 
 def sanitize_topic(topic: str, *, fallback: str = "Untitled") -> str:
     topic = topic.strip()
-    topic = re.sub(r"[\\/]+", "-", topic)
-    topic = re.sub(r"[:*?\"<>|]", "", topic)
-    topic = re.sub(r"\s+", " ", topic).strip()
+    if "/" in topic or "\\" in topic:
+        topic = _SLASHES_RE.sub("-", topic)
+    topic = topic.translate(_UNSAFE_FILENAME_CHARS)
+    topic = _WS_RE.sub(" ", topic).strip()
     return topic or fallback
 
 
@@ -31,8 +47,8 @@ def ensure_topic_file(topic_file: Path, *, topic_title: str) -> bool:
 
 def _cleanup_transcript(text: str) -> str:
     text = text.replace("\r\n", "\n").replace("\r", "\n")
-    text = re.sub(r"[ \t]+\n", "\n", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _TRAILING_BLANKS_RE.sub("\n", text)
+    text = _EXTRA_NEWLINES_RE.sub("\n\n", text)
     return text.strip()
 
 
@@ -41,13 +57,21 @@ def voice_dump_marker(sha256: str) -> str:
 
 
 def notebook_contains_sha256(topic_file: Path, sha256: str) -> bool:
-    if not topic_file.exists():
-        return False
+    # The marker is pure ASCII, so a byte search over a read-only mapping is equivalent to searching
+    # the decoded text, without decoding (or even copying) the whole notebook.
     try:
-        text = topic_file.read_text(encoding="utf-8")
-    except OSError:
+        with topic_file.open("rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return False  # mmap refuses zero-length files
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm.find(voice_dump_marker(sha256).encode("ascii")) != -1
+    except (OSError, ValueError):
         return False
-    return voice_dump_marker(sha256) in text
+
+
+def has_commentary_header(text: str) -> bool:
+    # Anchored match instead of `text.lstrip().startswith(...)`: no copy of the whole commentary.
+    return _COMMENTARY_HEADER_RE.match(text) is not None
 
 
 def format_voice_dump_section(
@@ -76,22 +100,21 @@ def format_voice_dump_section(
 
 
 def append_block(topic_file: Path, block: str, *, include_separator: bool) -> None:
-    block = block.rstrip("\n") + "\n"
-
-    prefix = ""
-    if topic_file.exists() and topic_file.stat().st_size > 0:
-        with topic_file.open("rb") as f:
-            f.seek(max(0, topic_file.stat().st_size - 2))
-            tail = f.read()
-        if not tail.endswith(b"\n"):
-            prefix += "\n"
-        if include_separator:
-            prefix += "\n---\n\n"
-
-    with topic_file.open("a", encoding="utf-8") as f:
-        if prefix:
-            f.write(prefix)
-        f.write(block)
+    data = (block.rstrip("\n") + "\n").encode("utf-8")
+
+    # One descriptor does it all: "ab+" creates the file if needed, seeking to the end gives the
+    # size, and writes always land at the end regardless of where we last read.
+    with topic_file.open("ab+") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size:
+            prefix = b""
+            f.seek(size - 1)
+            if f.read(1) != b"\n":
+                prefix += b"\n"
+            if include_separator:
+                prefix += b"\n---\n\n"
+            data = prefix + data
+        f.write(data)
 
 
 @dataclass(frozen=True)
@@ -106,26 +129,69 @@ class LatestSections:
     last_section_kind: str | None
 
 
-def extract_latest_sections(topic_file: Path) -> LatestSections:
-    if not topic_file.exists():
-        return LatestSections(latest_voice_dump=None, latest_ai_commentary=None, last_section_kind=None)
+# A notebook's text plus `(start, end, kind)` for each section header, oldest first. Sections are
+# only sliced out of the text once a caller actually wants them.
+_Sections = tuple[str, tuple[tuple[int, int, str], ...]]
+_NO_SECTIONS: _Sections = ("", ())
 
-    text = topic_file.read_text(encoding="utf-8")
-    matches = list(_SECTION_RE.finditer(text))
-    if not matches:
-        return LatestSections(latest_voice_dump=None, latest_ai_commentary=None, last_section_kind=None)
 
-    sections: list[tuple[str, str]] = []
-    for i, m in enumerate(matches):
-        start = m.start()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
-        kind = m.group(1)
-        sections.append((kind, text[start:end].strip()))
+def _parse_sections(topic_file: Path) -> _Sections:
+    try:
+        st = topic_file.stat()
+    except FileNotFoundError:
+        return _NO_SECTIONS
+    return _parse_sections_cached(str(topic_file), st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_sections_cached(path: str, mtime_ns: int, size: int) -> _Sections:
+    # Keyed on (mtime_ns, size) so every append invalidates; tuples keep cached results immutable.
+    # Each entry pins a whole notebook's text and every append orphans the previous one, so only
+    # the last few are kept: enough for repeated reads of the notebook being worked on.
+    return _index_sections(Path(path).read_text(encoding="utf-8"))
+
+
+def _index_sections(text: str) -> _Sections:
+    headers: list[tuple[int, int, str]] = []
+    prev_start = -1
+    prev_kind = ""
+    for m in _SECTION_RE.finditer(text):
+        if prev_start >= 0:
+            headers.append((prev_start, m.start(), prev_kind))
+        prev_start, prev_kind = m.start(), m.group(1)
+    if prev_start >= 0:
+        headers.append((prev_start, len(text), prev_kind))
+    return text, tuple(headers)
+
+
+def _read_tail_sections(topic_file: Path, start: int) -> _Sections:
+    with topic_file.open("rb") as f:
+        f.seek(start)
+        data = f.read()
+    # Drop the (probably partial) first line so we begin on a line boundary; a UTF-8 newline byte
+    # never sits inside a multi-byte character, so the rest decodes cleanly.
+    nl = data.find(b"\n")
+    data = data[nl + 1 :] if nl != -1 else b""
+    text = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+    return _index_sections(text)
+
+
+def extract_latest_sections(topic_file: Path) -> LatestSections:
+    text, headers = _parse_sections(topic_file)
+    if not headers:
+        return LatestSections(latest_voice_dump=None, latest_ai_commentary=None, last_section_kind=None)
 
-    latest_voice = next((s for k, s in reversed(sections) if k == "Voice Dump"), None)
-    latest_ai = next((s for k, s in reversed(sections) if k == "AI Commentary"), None)
-    last_kind = sections[-1][0] if sections else None
-    return LatestSections(latest_voice_dump=latest_voice, latest_ai_commentary=latest_ai, last_section_kind=last_kind)
+    latest: dict[str, str] = {}
+    for start, end, kind in reversed(headers):
+        if kind not in latest:
+            latest[kind] = text[start:end].strip()
+            if len(latest) == 2:
+                break
+    return LatestSections(
+        latest_voice_dump=latest.get("Voice Dump"),
+        latest_ai_commentary=latest.get("AI Commentary"),
+        last_section_kind=headers[-1][2],
+    )
 
 
 def extract_context(
@@ -136,29 +202,56 @@ def extract_context(
     max_chars: int,
     skip_latest_voice_dump: bool = False,
 ) -> NotebookContext:
-    if not topic_file.exists():
+    if voice_dumps <= 0 and ai_commentaries <= 0:
         return NotebookContext(markdown="")
-
-    text = topic_file.read_text(encoding="utf-8")
-    matches = list(_SECTION_RE.finditer(text))
-    if not matches:
+    try:
+        size = topic_file.stat().st_size
+    except FileNotFoundError:
         return NotebookContext(markdown="")
 
-    sections: list[tuple[str, str]] = []
-    for i, m in enumerate(matches):
-        start = m.start()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
-        kind = m.group(1)
-        sections.append((kind, text[start:end].strip()))
-
-    selected_rev: list[str] = []
+    select = functools.partial(
+        _select_context,
+        voice_dumps=voice_dumps,
+        ai_commentaries=ai_commentaries,
+        max_chars=max_chars,
+        skip_latest_voice_dump=skip_latest_voice_dump,
+    )
+
+    # Notebooks only grow, but context only ever comes from the newest few sections: parse a tail
+    # window first and widen it only if the selection ran out of sections before it was satisfied.
+    window = _TAIL_WINDOW_BYTES
+    while window < size:
+        markdown, complete = select(_read_tail_sections(topic_file, size - window))
+        if complete:
+            return NotebookContext(markdown=markdown)
+        window *= 2
+
+    markdown, _ = select(_parse_sections(topic_file))
+    return NotebookContext(markdown=markdown)
+
+
+def _select_context(
+    sections: _Sections,
+    *,
+    voice_dumps: int,
+    ai_commentaries: int,
+    max_chars: int,
+    skip_latest_voice_dump: bool,
+) -> tuple[str, bool]:
+    """
+    Returns `(markdown, complete)`; `complete` is False when every section was walked without
+    hitting a quota or the size cap, i.e. older sections could still change the result.
+    """
+    selected: deque[str] = deque()
     remaining_voice = voice_dumps
     remaining_ai = ai_commentaries
     total = 0
     sep_len = len("\n\n---\n\n")
     skipped_voice = False
+    complete = False
 
-    for kind, content in reversed(sections):
+    text, headers = sections
+    for start, end, kind in reversed(headers):
         if kind == "Voice Dump" and skip_latest_voice_dump and not skipped_voice:
             skipped_voice = True
             continue
@@ -167,19 +260,20 @@ def extract_context(
         if kind == "AI Commentary" and remaining_ai <= 0:
             continue
 
-        block = content.strip()
-        block_len = len(block) + (sep_len if selected_rev else 0)
-        if selected_rev and (total + block_len) > max_chars:
+        block = text[start:end].strip()
+        block_len = len(block) + (sep_len if selected else 0)
+        if selected and (total + block_len) > max_chars:
+            complete = True
             break
 
-        selected_rev.append(block)
+        selected.appendleft(block)
         total += block_len
         if kind == "Voice Dump":
             remaining_voice -= 1
         else:
             remaining_ai -= 1
         if remaining_voice <= 0 and remaining_ai <= 0:
+            complete = True
             break
 
-    selected = list(reversed(selected_rev))
-    return NotebookContext(markdown="\n\n---\n\n".join(selected).strip())
+    return "\n\n---\n\n".join(selected).strip(), complete
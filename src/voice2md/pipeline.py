@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import os
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -11,6 +12,7 @@ from voice2md.config import AppConfig
 from voice2md.markdown import (
     extract_context,
     format_voice_dump_section,
+    has_commentary_header,
     notebook_contains_sha256,
     sanitize_topic,
     topic_file_path,
@@ -42,6 +44,19 @@ def _infer_dump_time(audio_path: Path) -> datetime:
         return datetime.now()
 
 
+def _is_source_processed(
+    state: StateStore, source_key: str, *, source_mtime_ns: int, source_size: int
+) -> bool:
+    if state.is_source_processed(source_key, source_mtime_ns=source_mtime_ns, source_size=source_size):
+        return True
+    # Rows written by versions that keyed sources by `Path.resolve()` only match the resolved path
+    # (e.g. /var -> /private/var on macOS). Resolve only on a miss, and look again only if it differs.
+    resolved = os.path.realpath(source_key)
+    return resolved != source_key and state.is_source_processed(
+        resolved, source_mtime_ns=source_mtime_ns, source_size=source_size
+    )
+
+
 def process_audio_file(
     cfg: AppConfig,
     *,
@@ -49,7 +64,10 @@ def process_audio_file(
     state: StateStore,
     force: bool = False,
 ) -> ProcessOutcome | None:
-    audio_path = audio_path.expanduser().resolve()
+    # Absolute, not resolved: resolve() walks every component with lstat/readlink. A symlinked copy
+    # of an already-processed file is still caught by the sha256 check below.
+    source_key = os.path.abspath(os.path.expanduser(audio_path))
+    audio_path = Path(source_key)
     if not audio_path.exists():
         log.warning("File vanished before processing: %s", audio_path)
         return None
@@ -62,31 +80,29 @@ def process_audio_file(
         log.warning("File vanished before processing: %s", audio_path)
         return None
 
-    if (
-        not force
-        and state.is_source_processed(
-            audio_path, source_mtime_ns=source_mtime_ns, source_size=source_size
-        )
+    if not force and _is_source_processed(
+        state, source_key, source_mtime_ns=source_mtime_ns, source_size=source_size
     ):
         log.info("Already processed (source path): %s", audio_path.name)
         return None
 
     sha = sha256_file(audio_path)
-    if state.is_processed(sha) and not force:
-        log.info("Already processed (sha256): %s", audio_path.name)
-        return None
-
-    if not state.allow_retry_in_progress(sha, cfg.processing.in_progress_ttl_seconds) and not force:
-        log.info("In-progress elsewhere (skipping for now): %s", audio_path.name)
-        return None
-
-    state.mark_in_progress(
+    # Check-and-claim in one atomic step, so no other process can claim the same sha between the
+    # check and the in-progress write. Transcription runs outside it.
+    claimed = state.try_claim(
         sha,
-        audio_path,
+        source_key,
         source_mtime_ns=source_mtime_ns,
         source_size=source_size,
-        force=True,
+        ttl_seconds=cfg.processing.in_progress_ttl_seconds,
+        force=force,
     )
+    if not claimed:
+        if state.is_processed(sha):
+            log.info("Already processed (sha256): %s", audio_path.name)
+        else:
+            log.info("In-progress elsewhere (skipping for now): %s", audio_path.name)
+        return None
     dumped_at = _infer_dump_time(audio_path)
 
     transcriber = build_transcriber(cfg.transcription)
@@ -123,7 +139,9 @@ def process_audio_file(
             log.warning("Archive copy failed; continuing without archived link: %s (%s)", audio_path, e)
             archived_audio = None
 
-    if notebook_contains_sha256(topic_file, sha) and not force:
+    # A notebook we just created can't hold the marker, and `force` ignores it anyway, so only
+    # scan the file when the answer can change what happens next.
+    if not force and not created and notebook_contains_sha256(topic_file, sha):
         log.info("Notebook already contains sha256 marker; skipping append: %s", audio_path.name)
         if (
             cfg.audio.archive_copy_enabled
@@ -139,7 +157,7 @@ def process_audio_file(
             archive_path=archived_audio,
             topic_file=topic_file,
             codex_status="skipped",
-            source_path=audio_path,
+            source_path=source_key,
             source_mtime_ns=source_mtime_ns,
             source_size=source_size,
         )
@@ -179,7 +197,7 @@ def process_audio_file(
             )
             result = run_codex(cfg.codex, stdin_prompt=stdin_prompt)
             commentary = result.markdown.strip()
-            if not commentary.lstrip().startswith("## AI Commentary —"):
+            if not has_commentary_header(commentary):
                 commentary = f"## AI Commentary — {today}\n\n{commentary}"
             append_block(topic_file, commentary, include_separator=True)
             codex_status = "ok"
@@ -210,7 +228,7 @@ def process_audio_file(
         archive_path=archived_audio,
         topic_file=topic_file,
         codex_status=codex_status,
-        source_path=audio_path,
+        source_path=source_key,
         source_mtime_ns=source_mtime_ns,
         source_size=source_size,
     )
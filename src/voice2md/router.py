@@ -1,17 +1,46 @@
 from __future__ import annotations
 
+import os
 import re
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime
-from pathlib import Path
 
+# google-re2 (optional) matches in linear time, so the whole-transcript line scans below can't
+# backtrack pathologically on long dictations. Other distributions of a `re2` module (pyre2, old
+# wrappers) have different APIs; `Options` marks Google's.
+try:
+    import re2 as _line_re
 
-_TOPIC_RE = re.compile(r"(?im)^\s*TOPIC\s*:\s*(.+?)\s*$")
-_META_LINE_RE = re.compile(r"(?i)^\s*(topic|mode)\s*:\s*.+$")
-_DATE_RE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b")
+    if not hasattr(_line_re, "Options"):
+        _line_re = re
+except ImportError:
+    _line_re = re
 
+# RE2's `\s` is ASCII-only while `re`'s is Unicode (an NBSP-indented TOPIC line must still count),
+# so under RE2 the line patterns use a class covering exactly the characters `re` treats as `\s`.
+_WS = r"\s" if _line_re is re else r"[\t\n\v\f\r\x1c-\x1f\x{85}\p{Z}]"
+_TOPIC_RE = _line_re.compile(rf"(?im)^{_WS}*TOPIC{_WS}*:{_WS}*(.+?){_WS}*$")
+# Matched against single stripped lines, so no trailing `$`: the engines disagree on whether it
+# matches before a final newline.
+_META_LINE_RE = _line_re.compile(rf"(?i)^{_WS}*(topic|mode){_WS}*:{_WS}*.+")
 
-@dataclass(frozen=True)
+# How far into a transcript `tokens_from_transcript` looks for a TOPIC line.
+_TOPIC_SCAN_CHARS = 2048
+
+# Date plus the separator run after it, so the topic comes out of one search: equivalent to
+# `.strip().lstrip(" _-–—:").strip()` on whatever follows the date.
+_FILENAME_TOPIC_RE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b\s*[ _\-–—:]*(.*)", re.S)
+_FILENAME_TOPIC_SEPARATORS = " _-–—:"
+
+
+# Values of `RouteDecision.topic_source` / `mode_source`. Each decision shares these objects.
+SOURCE_FILENAME = "filename"
+SOURCE_TRANSCRIPT = "transcript"
+SOURCE_INFERRED = "inferred"
+
+
+@dataclass(frozen=True, slots=True)
 class RouteDecision:
     topic: str
     mode: str
@@ -28,56 +57,72 @@ def _first_match(pattern: re.Pattern[str], text: str) -> str | None:
 
 
 def tokens_from_transcript(transcript: str) -> str | None:
-    return _first_match(_TOPIC_RE, transcript)
+    # A spoken TOPIC token opens the dictation, so only the head of a long transcript is searched,
+    # extended to the end of the line that straddles the limit.
+    end = transcript.find("\n", _TOPIC_SCAN_CHARS)
+    head = transcript if end == -1 else transcript[:end]
+    return _first_match(_TOPIC_RE, head)
 
 
-def filename_hints(audio_path: Path) -> str | None:
+def filename_hints(audio_path: str | os.PathLike[str]) -> str | None:
     """
     Parses `<anything>YYYY-MM-DD<topic>.ext`:
       - finds the first `YYYY-MM-DD` in the basename (no extension)
       - treats everything after it as the topic
     """
-    base = audio_path.stem
-    m = _DATE_RE.search(base)
+    return _topic_from_stem(_stem(audio_path))
+
+
+def _stem(path: str | os.PathLike[str]) -> str:
+    """`PurePath(path).stem` without building a path object."""
+    name = os.path.basename(os.fspath(path))
+    dot = name.rfind(".")
+    return name[:dot] if 0 < dot < len(name) - 1 else name
+
+
+def _topic_from_stem(stem: str) -> str | None:
+    if _starts_with_date(stem):
+        # Common case, `YYYY-MM-DD <topic>`: slice instead of running the regex.
+        topic = stem[10:].lstrip().lstrip(_FILENAME_TOPIC_SEPARATORS).strip()
+        return topic or None
+    m = _FILENAME_TOPIC_RE.search(stem)
     if not m:
         return None
+    return m.group(1).strip() or None
+
+
+def _starts_with_date(stem: str) -> bool:
+    """Whether `stem` opens with a `YYYY-MM-DD` that `_FILENAME_TOPIC_RE` would match there."""
+    return (
+        len(stem) >= 10
+        and stem[4] == "-"
+        and stem[7] == "-"
+        and stem[:4].isdecimal()
+        and stem[5:7].isdecimal()
+        and stem[8:10].isdecimal()
+        # The regex's trailing `\b`: the date can't run on into a word character.
+        and (len(stem) == 10 or not (stem[10].isalnum() or stem[10] == "_"))
+    )
+
+
+# One alternation per category: each category costs a single scan of the transcript instead of
+# one scan per phrase.
+_CLAIMS_RE = re.compile(
+    r"\b(?:"
+    r"this proves|obviously|therefore|thus|must be|causes|leads to|results in|the real reason is"
+    r")\b"
+)
+
+_MODEL_RE = re.compile(
+    r"\b(?:"
+    r"model|framework|assumptions?|mechanism|variables?|equations?|(?:let's|lets)\s+define"
+    r"|operationali[sz]e"
+    r")\b"
+)
 
-    topic = base[m.end() :].strip()
-    topic = topic.lstrip(" _-–—:").strip()
-    return topic or None
-
-
-_CLAIMS_PATTERNS = [
-    re.compile(r"\bthis proves\b"),
-    re.compile(r"\bobviously\b"),
-    re.compile(r"\btherefore\b"),
-    re.compile(r"\bthus\b"),
-    re.compile(r"\bmust be\b"),
-    re.compile(r"\bcauses\b"),
-    re.compile(r"\bleads to\b"),
-    re.compile(r"\bresults in\b"),
-    re.compile(r"\bthe real reason is\b"),
-]
-
-_MODEL_PATTERNS = [
-    re.compile(r"\bmodel\b"),
-    re.compile(r"\bframework\b"),
-    re.compile(r"\bassumption(s)?\b"),
-    re.compile(r"\bmechanism\b"),
-    re.compile(r"\bvariable(s)?\b"),
-    re.compile(r"\bequation(s)?\b"),
-    re.compile(r"\b(let's|lets)\s+define\b"),
-    re.compile(r"\boperationali[sz]e\b"),
-]
-
-_PREP_FOR_SHARING_PATTERNS = [
-    re.compile(r"\bwrite this up\b"),
-    re.compile(r"\bfor sharing\b"),
-    re.compile(r"\bpublish\b"),
-    re.compile(r"\bblog\b"),
-    re.compile(r"\bnewsletter\b"),
-    re.compile(r"\bpresentation\b"),
-]
+_PREP_FOR_SHARING_RE = re.compile(
+    r"\b(?:write this up|for sharing|publish|blog|newsletter|presentation)\b"
+)
 
 
 def _strip_meta_lines(transcript: str) -> str:
@@ -93,129 +138,141 @@ def infer_mode(transcript: str) -> str:
     Modes are used only as a lightweight label in the Markdown header and as a hint to the referee
     prompt; they're not required to be perfect.
     """
-    text = _strip_meta_lines(transcript).lower()
-    if any(p.search(text) for p in _PREP_FOR_SHARING_PATTERNS):
+    return _mode_from_content(_strip_meta_lines(transcript))
+
+
+def _mode_from_content(cleaned: str) -> str:
+    text = cleaned.lower()
+    if _PREP_FOR_SHARING_RE.search(text):
         return "prep for sharing"
-    if any(p.search(text) for p in _CLAIMS_PATTERNS):
+    if _CLAIMS_RE.search(text):
         return "claims"
-    if any(p.search(text) for p in _MODEL_PATTERNS):
+    if _MODEL_RE.search(text):
         return "model-forming"
     return "brainstorming"
 
-_STOPWORDS = {
-    "a",
-    "about",
-    "after",
-    "again",
-    "all",
-    "also",
-    "am",
-    "an",
-    "and",
-    "any",
-    "are",
-    "as",
-    "at",
-    "back",
-    "be",
-    "because",
-    "been",
-    "before",
-    "but",
-    "by",
-    "can",
-    "could",
-    "did",
-    "do",
-    "does",
-    "doing",
-    "down",
-    "even",
-    "for",
-    "from",
-    "get",
-    "getting",
-    "go",
-    "going",
-    "got",
-    "had",
-    "has",
-    "have",
-    "having",
-    "he",
-    "her",
-    "here",
-    "hers",
-    "him",
-    "his",
-    "how",
-    "i",
-    "if",
-    "in",
-    "into",
-    "is",
-    "it",
-    "its",
-    "just",
-    "like",
-    "lot",
-    "me",
-    "more",
-    "most",
-    "my",
-    "no",
-    "not",
-    "now",
-    "of",
-    "on",
-    "one",
-    "or",
-    "our",
-    "out",
-    "really",
-    "right",
-    "said",
-    "say",
-    "saying",
-    "see",
-    "so",
-    "some",
-    "sort",
-    "that",
-    "the",
-    "their",
-    "them",
-    "then",
-    "there",
-    "these",
-    "they",
-    "this",
-    "to",
-    "up",
-    "us",
-    "very",
-    "was",
-    "we",
-    "were",
-    "what",
-    "when",
-    "which",
-    "with",
-    "would",
-    "yeah",
-    "you",
-    "your",
-}
+
+_STOPWORDS: frozenset[str] = frozenset(
+    {
+        "a",
+        "about",
+        "after",
+        "again",
+        "all",
+        "also",
+        "am",
+        "an",
+        "and",
+        "any",
+        "are",
+        "as",
+        "at",
+        "back",
+        "be",
+        "because",
+        "been",
+        "before",
+        "but",
+        "by",
+        "can",
+        "could",
+        "did",
+        "do",
+        "does",
+        "doing",
+        "down",
+        "even",
+        "for",
+        "from",
+        "get",
+        "getting",
+        "go",
+        "going",
+        "got",
+        "had",
+        "has",
+        "have",
+        "having",
+        "he",
+        "her",
+        "here",
+        "hers",
+        "him",
+        "his",
+        "how",
+        "i",
+        "if",
+        "in",
+        "into",
+        "is",
+        "it",
+        "its",
+        "just",
+        "like",
+        "lot",
+        "me",
+        "more",
+        "most",
+        "my",
+        "no",
+        "not",
+        "now",
+        "of",
+        "on",
+        "one",
+        "or",
+        "our",
+        "out",
+        "really",
+        "right",
+        "said",
+        "say",
+        "saying",
+        "see",
+        "so",
+        "some",
+        "sort",
+        "that",
+        "the",
+        "their",
+        "them",
+        "then",
+        "there",
+        "these",
+        "they",
+        "this",
+        "to",
+        "up",
+        "us",
+        "very",
+        "was",
+        "we",
+        "were",
+        "what",
+        "when",
+        "which",
+        "with",
+        "would",
+        "yeah",
+        "you",
+        "your",
+    }
+)
+
+
+_UPPERCASE_WORDS: frozenset[str] = frozenset({"ai", "ml", "uk", "us"})
 
 
 def _title_word(word: str) -> str:
     if word.isupper():
         return word
-    if word in {"ai", "ml", "uk", "us"}:
+    if word in _UPPERCASE_WORDS:
         return word.upper()
     return word.capitalize()
 
 
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z0-9']+")
+_WS_RE = re.compile(r"\s+")
 _ABOUT_PHRASE_RE = re.compile(
     r"(?i)\b(?:talk(?:ing)?|think(?:ing)?|reflect(?:ing)?|focus(?:ing)?|rant(?:ing)?)\s+about\s+(.{3,80}?)(?:[.\n\r!?]|$)"
 )
@@ -237,33 +294,32 @@ def infer_topic(
     explicit = tokens_from_transcript(transcript)
     if explicit:
         return explicit
+    return _infer_topic_from_content(
+        _strip_meta_lines(transcript), dumped_at=dumped_at, max_words=max_words, max_chars=max_chars
+    )
 
-    cleaned = _strip_meta_lines(transcript)
 
+def _infer_topic_from_content(
+    cleaned: str,
+    *,
+    dumped_at: datetime | None,
+    max_words: int,
+    max_chars: int,
+) -> str:
+    """`cleaned` is the transcript with its TOPIC:/MODE: lines already stripped."""
     for pattern in (_THIS_IS_ABOUT_RE, _ABOUT_PHRASE_RE):
         m = pattern.search(cleaned)
         if m:
             phrase = m.group(1).strip()
-            phrase = re.sub(r"\s+", " ", phrase)
+            phrase = _WS_RE.sub(" ", phrase)
             if phrase:
                 return phrase[:max_chars].rstrip()
 
-    words = re.findall(r"[A-Za-z][A-Za-z0-9']+", cleaned.lower())
-    positions: dict[str, int] = {}
-    freq: dict[str, int] = {}
-    for idx, w in enumerate(words):
-        w = w.strip("'")
-        if not w:
-            continue
-        if w in _STOPWORDS:
-            continue
-        if len(w) < 2:
-            continue
-        positions.setdefault(w, idx)
-        freq[w] = freq.get(w, 0) + 1
-
-    ranked = sorted(freq.keys(), key=lambda w: (-freq[w], positions.get(w, 10**9)))
-    picked = [_title_word(w) for w in ranked[:max_words]]
+    words = (w.strip("'") for w in _WORD_RE.findall(cleaned.lower()))
+    # Counter keeps first-seen order, and most_common() breaks frequency ties by that order, so this
+    # ranks exactly like "by frequency, then first position" without a full sort of every word.
+    freq = Counter(w for w in words if len(w) >= 2 and w not in _STOPWORDS)
+    picked = [_title_word(w) for w, _ in freq.most_common(max_words)]
     topic = " ".join(picked).strip()
     if topic:
         return topic[:max_chars].rstrip()
@@ -275,32 +331,43 @@ def infer_topic(
 
 def decide_route(
     *,
-    audio_path: Path,
+    audio_path: str | os.PathLike[str],
     transcript: str,
     dumped_at: datetime | None = None,
     infer_topic_max_words: int = 6,
     infer_topic_max_chars: int = 80,
 ) -> RouteDecision:
+    stem = _stem(audio_path)
+    # Topic and mode inference both work on the transcript minus its TOPIC:/MODE: lines; strip
+    # them once here instead of once per inference.
+    cleaned = _strip_meta_lines(transcript)
+
     # Priority:
     #   1) Filename hints
     #   2) Transcript/topic inference
-    fn_topic = filename_hints(audio_path)
+    fn_topic = _topic_from_stem(stem)
     if fn_topic:
         topic = fn_topic
-        topic_source = "filename"
+        topic_source = SOURCE_FILENAME
     else:
-        topic = infer_topic(
-            transcript,
-            dumped_at=dumped_at,
-            max_words=infer_topic_max_words,
-            max_chars=infer_topic_max_chars,
-        )
-        topic_source = "inferred" if topic and not tokens_from_transcript(transcript) else "transcript"
-
-    mode = infer_mode(transcript)
+        # Look for an explicit TOPIC line once, rather than once inside infer_topic and again here.
+        explicit = tokens_from_transcript(transcript)
+        if explicit:
+            topic = explicit
+            topic_source = SOURCE_TRANSCRIPT
+        else:
+            topic = _infer_topic_from_content(
+                cleaned,
+                dumped_at=dumped_at,
+                max_words=infer_topic_max_words,
+                max_chars=infer_topic_max_chars,
+            )
+            topic_source = SOURCE_INFERRED
+
+    mode = _mode_from_content(cleaned)
     return RouteDecision(
         topic=topic,
         mode=mode,
         topic_source=topic_source,
-        mode_source="inferred",
+        mode_source=SOURCE_INFERRED,
     )
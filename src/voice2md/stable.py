@@ -4,7 +4,7 @@ import os
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterable, Mapping
 
 
 @dataclass(frozen=True)
@@ -35,7 +35,16 @@ class StableFileTracker:
         self._clock = clock or time.monotonic
         self._seen: dict[Path, tuple[StatSnapshot, float]] = {}
 
-    def observe(self, candidates: list[Path]) -> list[Path]:
+    def observe(
+        self,
+        candidates: Iterable[Path],
+        snapshots: Mapping[Path, StatSnapshot] | None = None,
+    ) -> list[Path]:
+        """
+        Returns the candidates that have been unchanged for `stable_seconds`. Pass `snapshots` when
+        the caller already has fresh stats (e.g. from a directory scan) to skip re-statting.
+        """
+        candidates = list(candidates)
         now = self._clock()
         stable: list[Path] = []
 
@@ -45,10 +54,12 @@ class StableFileTracker:
                 self._seen.pop(path, None)
 
         for path in candidates:
-            try:
-                snap = self._stat(path)
-            except FileNotFoundError:
-                continue
+            snap = snapshots.get(path) if snapshots is not None else None
+            if snap is None:
+                try:
+                    snap = self._stat(path)
+                except FileNotFoundError:
+                    continue
 
             prior = self._seen.get(path)
             if prior is None:
@@ -2,14 +2,21 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import sqlite3
+import threading
 import time
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 log = logging.getLogger(__name__)
 
+# Paths cross the store's API as either `Path` or `str`; `os.fspath` passes a str through untouched.
+StrPath = str | os.PathLike[str]
+
 
 class StateError(RuntimeError):
     pass
@@ -30,10 +37,30 @@ class FileRecord:
     codex_status: str | None
 
 
+@dataclass(frozen=True)
+class ProcessedMark:
+    """One `mark_processed` call's arguments, for `StateStore.mark_many_processed`."""
+
+    sha256: str
+    archive_path: StrPath | None
+    topic_file: StrPath | None
+    codex_status: str | None
+    source_path: StrPath | None = None
+    source_mtime_ns: int | None = None
+    source_size: int | None = None
+
+
 class StateStore:
     def close(self) -> None:  # pragma: no cover
         raise NotImplementedError
 
+    def transaction(self) -> AbstractContextManager[None]:  # pragma: no cover
+        """
+        Groups several state calls into one unit of work: one commit (SQLite) or one save (JSON).
+        Nested uses join the outermost transaction.
+        """
+        raise NotImplementedError
+
     def get(self, sha256: str) -> FileRecord | None:  # pragma: no cover
         raise NotImplementedError
 
@@ -42,7 +69,7 @@ class StateStore:
 
     def is_source_processed(
         self,
-        source_path: Path,
+        source_path: StrPath,
         *,
         source_mtime_ns: int | None = None,
         source_size: int | None = None,
@@ -52,10 +79,16 @@ class StateStore:
     def processed_source_snapshots(self) -> dict[str, tuple[int | None, int | None]]:  # pragma: no cover
         raise NotImplementedError
 
+    def processed_source_snapshots_for(
+        self, source_paths: Iterable[StrPath]
+    ) -> dict[str, tuple[int | None, int | None]]:  # pragma: no cover
+        """Like `processed_source_snapshots`, restricted to `source_paths` (absent ones are omitted)."""
+        raise NotImplementedError
+
     def mark_in_progress(
         self,
         sha256: str,
-        source_path: Path,
+        source_path: StrPath,
         *,
         source_mtime_ns: int | None,
         source_size: int | None,
@@ -63,19 +96,82 @@ class StateStore:
     ) -> None:  # pragma: no cover
         raise NotImplementedError
 
+    def try_claim(
+        self,
+        sha256: str,
+        source_path: StrPath,
+        *,
+        source_mtime_ns: int | None,
+        source_size: int | None,
+        ttl_seconds: int,
+        force: bool = False,
+    ) -> bool:
+        """
+        Marks `sha256` in progress unless it is processed or freshly in progress elsewhere.
+
+        Returns whether the claim was taken; `force` always takes it.
+        """
+        with self.transaction():
+            if not force and not self.allow_retry_in_progress(sha256, ttl_seconds):
+                return False
+            self.mark_in_progress(
+                sha256, source_path, source_mtime_ns=source_mtime_ns, source_size=source_size, force=True
+            )
+            return True
+
     def mark_processed(
         self,
         sha256: str,
         *,
-        archive_path: Path | None,
-        topic_file: Path | None,
+        archive_path: StrPath | None,
+        topic_file: StrPath | None,
         codex_status: str | None,
-        source_path: Path | None = None,
+        source_path: StrPath | None = None,
         source_mtime_ns: int | None = None,
         source_size: int | None = None,
     ) -> None:  # pragma: no cover
         raise NotImplementedError
 
+    def record_completion(
+        self,
+        sha256: str,
+        source_path: StrPath,
+        *,
+        source_mtime_ns: int | None,
+        source_size: int | None,
+        archive_path: StrPath | None,
+        topic_file: StrPath | None,
+        codex_status: str | None,
+    ) -> None:
+        """Claims and completes a file in one transaction: `mark_in_progress` then `mark_processed`."""
+        with self.transaction():
+            self.mark_in_progress(
+                sha256, source_path, source_mtime_ns=source_mtime_ns, source_size=source_size, force=True
+            )
+            self.mark_processed(
+                sha256,
+                archive_path=archive_path,
+                topic_file=topic_file,
+                codex_status=codex_status,
+                source_path=source_path,
+                source_mtime_ns=source_mtime_ns,
+                source_size=source_size,
+            )
+
+    def mark_many_processed(self, marks: Iterable[ProcessedMark]) -> None:
+        """Applies `mark_processed` for each entry as a single transaction."""
+        with self.transaction():
+            for m in marks:
+                self.mark_processed(
+                    m.sha256,
+                    archive_path=m.archive_path,
+                    topic_file=m.topic_file,
+                    codex_status=m.codex_status,
+                    source_path=m.source_path,
+                    source_mtime_ns=m.source_mtime_ns,
+                    source_size=m.source_size,
+                )
+
     def mark_failed(self, sha256: str, error: str) -> None:  # pragma: no cover
         raise NotImplementedError
 
@@ -123,10 +219,24 @@ class JsonStateStore(StateStore):
         self._path = path
         self._path.parent.mkdir(parents=True, exist_ok=True)
         self._data = self._load_or_init()
+        self._tx_depth = 0
+        self._dirty = False
 
     def close(self) -> None:
         return
 
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        # Defers `_save()` to the end of the outermost block. There is no rollback: whatever was
+        # changed is written even if the block raises, exactly as if each call had saved itself.
+        self._tx_depth += 1
+        try:
+            yield
+        finally:
+            self._tx_depth -= 1
+            if self._tx_depth == 0 and self._dirty:
+                self._save()
+
     def _load_or_init(self) -> dict[str, Any]:
         if not self._path.exists():
             return {"version": 1, "records": {}, "source_snapshots": {}}
@@ -154,6 +264,10 @@ class JsonStateStore(StateStore):
         return data
 
     def _save(self) -> None:
+        if self._tx_depth:
+            self._dirty = True
+            return
+        self._dirty = False
         tmp = self._path.with_suffix(self._path.suffix + ".tmp")
         text = json.dumps(self._data, indent=2, sort_keys=True)
         tmp.write_text(text + "\n", encoding="utf-8")
@@ -189,12 +303,12 @@ class JsonStateStore(StateStore):
 
     def is_source_processed(
         self,
-        source_path: Path,
+        source_path: StrPath,
         *,
         source_mtime_ns: int | None = None,
         source_size: int | None = None,
     ) -> bool:
-        snap = self._source_snapshots().get(str(source_path))
+        snap = self._source_snapshots().get(os.fspath(source_path))
         if not isinstance(snap, dict):
             return False
         mtime_ns = snap.get("mtime_ns")
@@ -213,10 +327,22 @@ class JsonStateStore(StateStore):
             out[path] = (snap.get("mtime_ns"), snap.get("size"))
         return out
 
+    def processed_source_snapshots_for(
+        self, source_paths: Iterable[StrPath]
+    ) -> dict[str, tuple[int | None, int | None]]:
+        snapshots = self._source_snapshots()
+        out: dict[str, tuple[int | None, int | None]] = {}
+        for source_path in source_paths:
+            key = os.fspath(source_path)
+            snap = snapshots.get(key)
+            if isinstance(snap, dict):
+                out[key] = (snap.get("mtime_ns"), snap.get("size"))
+        return out
+
     def mark_in_progress(
         self,
         sha256: str,
-        source_path: Path,
+        source_path: StrPath,
         *,
         source_mtime_ns: int | None,
         source_size: int | None,
@@ -233,7 +359,7 @@ class JsonStateStore(StateStore):
                 "status": "in_progress",
                 "started_at": time.time(),
                 "processed_at": None,
-                "source_path": str(source_path),
+                "source_path": os.fspath(source_path),
                 "source_mtime_ns": source_mtime_ns,
                 "source_size": source_size,
                 "error": None,
@@ -246,13 +372,14 @@ class JsonStateStore(StateStore):
         self,
         sha256: str,
         *,
-        archive_path: Path | None,
-        topic_file: Path | None,
+        archive_path: StrPath | None,
+        topic_file: StrPath | None,
         codex_status: str | None,
-        source_path: Path | None = None,
+        source_path: StrPath | None = None,
         source_mtime_ns: int | None = None,
         source_size: int | None = None,
     ) -> None:
+        source_key = os.fspath(source_path) if source_path else None
         records = self._records()
         rec = records.get(sha256, {})
         if not isinstance(rec, dict):
@@ -262,19 +389,19 @@ class JsonStateStore(StateStore):
                 "status": "processed",
                 "started_at": None,
                 "processed_at": time.time(),
-                "source_path": str(source_path) if source_path else rec.get("source_path"),
+                "source_path": source_key or rec.get("source_path"),
                 "source_mtime_ns": source_mtime_ns if source_mtime_ns is not None else rec.get("source_mtime_ns"),
                 "source_size": source_size if source_size is not None else rec.get("source_size"),
-                "archive_path": str(archive_path) if archive_path else None,
-                "topic_file": str(topic_file) if topic_file else None,
+                "archive_path": os.fspath(archive_path) if archive_path else None,
+                "topic_file": os.fspath(topic_file) if topic_file else None,
                 "codex_status": codex_status,
                 "error": None,
             }
         )
         records[sha256] = rec
 
-        if source_path and source_mtime_ns is not None and source_size is not None:
-            self._source_snapshots()[str(source_path)] = {
+        if source_key and source_mtime_ns is not None and source_size is not None:
+            self._source_snapshots()[source_key] = {
                 "mtime_ns": int(source_mtime_ns),
                 "size": int(source_size),
             }
@@ -319,57 +446,339 @@ class JsonStateStore(StateStore):
         return out
 
 
+# Per-connection tuning. WAL lets `voice2md status` read while the watcher writes, and with
+# synchronous=NORMAL a commit only appends to the WAL instead of fsyncing the main database.
+_SQLITE_WAL_PRAGMA = "PRAGMA journal_mode=WAL"
+_SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Read-only connections a store keeps open between reads; extra ones opened under concurrent load
+# are closed when returned.
+_MAX_IDLE_READERS = 4
+
+# Everything `_init_schema` creates; if any is missing on open, the schema is new or changing.
+_SCHEMA_OBJECTS = frozenset(
+    {"processed_files", "idx_processed_files_source", "idx_processed_files_source_stat"}
+)
+
+
+# Stored in the database header once `_init_schema` has applied the DDL below; bump it whenever that
+# DDL changes so existing databases pick the change up on their next open.
+_SCHEMA_VERSION = 1
+
+_SQL_SCHEMA_NAMES = "SELECT name FROM sqlite_master WHERE type IN ('table', 'index')"
+
+_SQL_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS processed_files (
+  sha256 TEXT PRIMARY KEY,
+  status TEXT NOT NULL,
+  started_at REAL,
+  processed_at REAL,
+  source_path TEXT,
+  source_mtime_ns INTEGER,
+  source_size INTEGER,
+  archive_path TEXT,
+  topic_file TEXT,
+  codex_status TEXT,
+  error TEXT
+)
+"""
+
+# Columns added after the first release, for databases created before them.
+_SQL_ADDED_COLUMNS = (
+    ("source_mtime_ns", "ALTER TABLE processed_files ADD COLUMN source_mtime_ns INTEGER"),
+    ("source_size", "ALTER TABLE processed_files ADD COLUMN source_size INTEGER"),
+)
+
+_SQL_CREATE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_processed_files_source ON processed_files (source_path)",
+    "CREATE INDEX IF NOT EXISTS idx_processed_files_source_stat"
+    " ON processed_files (source_path, source_mtime_ns, source_size)",
+)
+
+_SQL_GET = "SELECT * FROM processed_files WHERE sha256 = ?"
+
+_SQL_SOURCE_PROCESSED = """
+SELECT status, source_mtime_ns, source_size
+FROM processed_files
+WHERE source_path = ? AND status = 'processed'
+ORDER BY processed_at DESC
+LIMIT 1
+"""
+
+_SQL_PROCESSED_SOURCES = """
+SELECT source_path, source_mtime_ns, source_size, processed_at
+FROM processed_files
+WHERE status='processed' AND source_path IS NOT NULL
+"""
+
+_SQL_PROCESSED_SOURCES_IN = """
+SELECT source_path, source_mtime_ns, source_size, processed_at
+FROM processed_files
+WHERE status='processed' AND source_path IN ({params})
+"""
+_IN_BATCH = 500
+
+_SQL_MARK_IN_PROGRESS_FORCE = """
+INSERT INTO processed_files (sha256, status, started_at, source_path, source_mtime_ns, source_size)
+VALUES (?, 'in_progress', ?, ?, ?, ?)
+ON CONFLICT(sha256) DO UPDATE SET
+  status='in_progress',
+  started_at=excluded.started_at,
+  source_path=excluded.source_path,
+  source_mtime_ns=excluded.source_mtime_ns,
+  source_size=excluded.source_size,
+  error=NULL
+"""
+
+_SQL_MARK_IN_PROGRESS = """
+INSERT INTO processed_files (sha256, status, started_at, source_path, source_mtime_ns, source_size)
+VALUES (?, 'in_progress', ?, ?, ?, ?)
+ON CONFLICT(sha256) DO NOTHING
+"""
+
+# Claims unless the row is processed or was claimed within the TTL (the last parameter); the
+# statement changes a row exactly when the claim succeeds.
+_SQL_TRY_CLAIM = """
+INSERT INTO processed_files (sha256, status, started_at, source_path, source_mtime_ns, source_size)
+VALUES (?, 'in_progress', ?, ?, ?, ?)
+ON CONFLICT(sha256) DO UPDATE SET
+  status='in_progress',
+  started_at=excluded.started_at,
+  source_path=excluded.source_path,
+  source_mtime_ns=excluded.source_mtime_ns,
+  source_size=excluded.source_size,
+  error=NULL
+WHERE processed_files.status != 'processed'
+  AND NOT (
+    processed_files.status = 'in_progress'
+    AND processed_files.started_at IS NOT NULL
+    AND excluded.started_at - processed_files.started_at <= ?
+  )
+"""
+
+_SQL_MARK_PROCESSED = """
+INSERT INTO processed_files (
+  sha256, status, started_at, processed_at, source_path, source_mtime_ns, source_size, archive_path, topic_file, codex_status, error
+)
+VALUES (?, 'processed', NULL, ?, ?, ?, ?, ?, ?, ?, NULL)
+ON CONFLICT(sha256) DO UPDATE SET
+  status='processed',
+  processed_at=excluded.processed_at,
+  source_path=COALESCE(excluded.source_path, source_path),
+  source_mtime_ns=COALESCE(excluded.source_mtime_ns, source_mtime_ns),
+  source_size=COALESCE(excluded.source_size, source_size),
+  archive_path=excluded.archive_path,
+  topic_file=excluded.topic_file,
+  codex_status=excluded.codex_status,
+  error=NULL
+"""
+
+_SQL_MARK_FAILED = """
+INSERT INTO processed_files (sha256, status, started_at, processed_at, error)
+VALUES (?, 'failed', NULL, ?, ?)
+ON CONFLICT(sha256) DO UPDATE SET
+  status='failed',
+  processed_at=excluded.processed_at,
+  error=excluded.error
+"""
+
+_SQL_STATS = "SELECT status, COUNT(*) as n FROM processed_files GROUP BY status"
+
+
+def _in_progress_params(
+    sha256: str,
+    source_path: StrPath,
+    source_mtime_ns: int | None,
+    source_size: int | None,
+    *,
+    now: float | None = None,
+) -> tuple[Any, ...]:
+    return (sha256, time.time() if now is None else now, os.fspath(source_path), source_mtime_ns, source_size)
+
+
+def _processed_params(
+    sha256: str,
+    now: float,
+    *,
+    archive_path: StrPath | None,
+    topic_file: StrPath | None,
+    codex_status: str | None,
+    source_path: StrPath | None,
+    source_mtime_ns: int | None,
+    source_size: int | None,
+) -> tuple[Any, ...]:
+    # Column order of `_SQL_MARK_PROCESSED`'s VALUES list.
+    return (
+        sha256,
+        now,
+        os.fspath(source_path) if source_path else None,
+        source_mtime_ns,
+        source_size,
+        os.fspath(archive_path) if archive_path else None,
+        os.fspath(topic_file) if topic_file else None,
+        codex_status,
+    )
+
+
+def _keep_latest(
+    latest: dict[str, tuple[float, int | None, int | None]], rows: Iterable[sqlite3.Row]
+) -> None:
+    # Several rows (different sha256s) can share a source path; the most recently processed wins.
+    for row in rows:
+        p = row["source_path"]
+        if not p:
+            continue
+        processed_at = float(row["processed_at"] or 0.0)
+        prev = latest.get(p)
+        if prev is None or processed_at >= prev[0]:
+            latest[p] = (processed_at, row["source_mtime_ns"], row["source_size"])
+
+
 class SqliteStateStore(StateStore):
     def __init__(self, db_path: Path) -> None:
         self._db_path = db_path
-        self._db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(self._db_path)
+        self._in_memory = in_memory = os.fspath(db_path) == ":memory:"
+        if not in_memory:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode: each write is its own transaction, and multi-statement work opens one
+        # explicitly instead of relying on the module's implicit BEGIN.
+        # The connection may be shared across threads (e.g. a watcher thread and the main loop);
+        # ``_lock`` serializes writes through it (and its shared cursor), and holds a transaction's
+        # statements together so another thread can't slip writes into it.
+        self._conn = sqlite3.connect(
+            self._db_path, isolation_level=None, cached_statements=128, check_same_thread=False
+        )
+        self._lock = threading.RLock()
         self._conn.row_factory = sqlite3.Row
+        # One cursor for the store's lifetime; the statements below are module constants, so each
+        # is prepared once and then served from the connection's statement cache.
+        self._cur = self._conn.cursor()
+        # Connection-level settings, applied once here rather than per statement. An in-memory
+        # database has no journal file to put in WAL mode.
+        pragmas = _SQLITE_PRAGMAS if in_memory else (_SQLITE_WAL_PRAGMA, *_SQLITE_PRAGMAS)
+        self._conn.executescript(";\n".join(pragmas))
+        # Thread that owns the open transaction, if any.
+        self._tx_owner: int | None = None
+        # Idle read-only connections (as cursors). Reads outside a transaction take one from here,
+        # opening another when all are busy, so they run alongside the writer instead of queueing
+        # on `_lock`; WAL gives each read a consistent snapshot of committed data. At most
+        # `_MAX_IDLE_READERS` are kept; `_pool_lock` guards the list and `_closed`.
+        self._idle_readers: list[sqlite3.Cursor] = []
+        self._pool_lock = threading.Lock()
+        self._closed = False
         self._init_schema()
 
     def close(self) -> None:
-        self._conn.close()
+        with self._lock:
+            with self._pool_lock:
+                self._closed = True
+                idle, self._idle_readers = self._idle_readers, []
+            # Readers checked out right now are closed when they are handed back.
+            for cur in idle:
+                cur.connection.close()
+            # Refreshes planner statistics only where SQLite judges them stale; usually a no-op.
+            # Best effort: a read-only file or a busy database must not keep close() from closing,
+            # nor replace whatever error the caller is already unwinding from.
+            try:
+                self._conn.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                log.debug("PRAGMA optimize skipped on close: %s", e)
+            finally:
+                self._conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        with self._lock:
+            if self._tx_owner is not None:
+                yield
+                return
+            # IMMEDIATE takes the write lock up front, so a read-then-write sequence inside the
+            # block can't be interleaved with another process's write.
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._tx_owner = threading.get_ident()
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._conn.execute("COMMIT")
+            finally:
+                self._tx_owner = None
+
+    def _open_reader(self) -> sqlite3.Cursor:
+        uri = f"{self._db_path.resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, cached_statements=128, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.executescript(";\n".join(_SQLITE_PRAGMAS))
+        return conn.cursor()
+
+    @contextmanager
+    def _reading(self) -> Iterator[sqlite3.Cursor]:
+        # Inside our own transaction a read must see its uncommitted writes, and an in-memory
+        # database can't be opened twice, so both use the writer.
+        if self._in_memory or self._tx_owner == threading.get_ident():
+            with self._lock:
+                yield self._cur
+            return
+        with self._pool_lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+            cur = self._idle_readers.pop() if self._idle_readers else None
+        if cur is None:
+            cur = self._open_reader()
+        try:
+            yield cur
+        finally:
+            with self._pool_lock:
+                keep = not self._closed and len(self._idle_readers) < _MAX_IDLE_READERS
+                if keep:
+                    self._idle_readers.append(cur)
+            if not keep:
+                cur.connection.close()
 
     def _init_schema(self) -> None:
+        # A database already stamped with this schema version needs no DDL, nor the write lock
+        # that applying it takes.
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        if version == _SCHEMA_VERSION:
+            return
         cur = self._conn.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS processed_files (
-              sha256 TEXT PRIMARY KEY,
-              status TEXT NOT NULL,
-              started_at REAL,
-              processed_at REAL,
-              source_path TEXT,
-              source_mtime_ns INTEGER,
-              source_size INTEGER,
-              archive_path TEXT,
-              topic_file TEXT,
-              codex_status TEXT,
-              error TEXT
-            )
-            """
-        )
-        self._ensure_columns(cur)
-        cur.execute(
-            "CREATE INDEX IF NOT EXISTS idx_processed_files_source ON processed_files (source_path)"
-        )
-        cur.execute(
-            "CREATE INDEX IF NOT EXISTS idx_processed_files_source_stat ON processed_files (source_path, source_mtime_ns, source_size)"
-        )
-        self._conn.commit()
-
-    def _ensure_columns(self, cur: sqlite3.Cursor) -> None:
+        # The connection context manager commits the explicit transaction, or rolls it back on error.
+        with self._conn:
+            cur.execute("BEGIN IMMEDIATE")
+            cur.execute(_SQL_SCHEMA_NAMES)
+            existing = {row[0] for row in cur.fetchall()}
+            cur.execute(_SQL_CREATE_TABLE)
+            migrated = self._ensure_columns(cur)
+            for sql in _SQL_CREATE_INDEXES:
+                cur.execute(sql)
+            # Gather planner statistics once after the schema is created or changed, rather than
+            # on every open; `PRAGMA optimize` at close keeps them fresh afterwards.
+            if migrated or not _SCHEMA_OBJECTS <= existing:
+                cur.execute("ANALYZE processed_files")
+            cur.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def _ensure_columns(self, cur: sqlite3.Cursor) -> bool:
         cur.execute("PRAGMA table_info(processed_files)")
         existing = {row[1] for row in cur.fetchall()}
-        if "source_mtime_ns" not in existing:
-            cur.execute("ALTER TABLE processed_files ADD COLUMN source_mtime_ns INTEGER")
-        if "source_size" not in existing:
-            cur.execute("ALTER TABLE processed_files ADD COLUMN source_size INTEGER")
+        migrated = False
+        for column, sql in _SQL_ADDED_COLUMNS:
+            if column not in existing:
+                cur.execute(sql)
+                migrated = True
+        return migrated
 
     def get(self, sha256: str) -> FileRecord | None:
-        cur = self._conn.cursor()
-        cur.execute("SELECT * FROM processed_files WHERE sha256 = ?", (sha256,))
-        row = cur.fetchone()
+        with self._reading() as cur:
+            cur.execute(_SQL_GET, (sha256,))
+            row = cur.fetchone()
         if row is None:
             return None
         return FileRecord(
@@ -392,23 +801,14 @@ class SqliteStateStore(StateStore):
 
     def is_source_processed(
         self,
-        source_path: Path,
+        source_path: StrPath,
         *,
         source_mtime_ns: int | None = None,
         source_size: int | None = None,
     ) -> bool:
-        cur = self._conn.cursor()
-        cur.execute(
-            """
-            SELECT status, source_mtime_ns, source_size
-            FROM processed_files
-            WHERE source_path = ? AND status = 'processed'
-            ORDER BY processed_at DESC
-            LIMIT 1
-            """,
-            (str(source_path),),
-        )
-        row = cur.fetchone()
+        with self._reading() as cur:
+            cur.execute(_SQL_SOURCE_PROCESSED, (os.fspath(source_path),))
+            row = cur.fetchone()
         if row is None:
             return False
         mtime_ns = row["source_mtime_ns"]
@@ -420,120 +820,148 @@ class SqliteStateStore(StateStore):
         return int(mtime_ns) == int(source_mtime_ns) and int(size) == int(source_size)
 
     def processed_source_snapshots(self) -> dict[str, tuple[int | None, int | None]]:
-        cur = self._conn.cursor()
-        cur.execute(
-            """
-            SELECT source_path, source_mtime_ns, source_size, processed_at
-            FROM processed_files
-            WHERE status='processed' AND source_path IS NOT NULL
-            """
-        )
         latest: dict[str, tuple[float, int | None, int | None]] = {}
-        for row in cur.fetchall():
-            p = row["source_path"]
-            if not p:
-                continue
-            processed_at = float(row["processed_at"] or 0.0)
-            mtime_ns = row["source_mtime_ns"]
-            size = row["source_size"]
-            prev = latest.get(p)
-            if prev is None or processed_at >= prev[0]:
-                latest[p] = (processed_at, mtime_ns, size)
+        with self._reading() as cur:
+            cur.execute(_SQL_PROCESSED_SOURCES)
+            _keep_latest(latest, cur.fetchall())
+        return {p: (mtime_ns, size) for p, (_t, mtime_ns, size) in latest.items()}
+
+    def processed_source_snapshots_for(
+        self, source_paths: Iterable[StrPath]
+    ) -> dict[str, tuple[int | None, int | None]]:
+        keys = list(dict.fromkeys(os.fspath(p) for p in source_paths))
+        latest: dict[str, tuple[float, int | None, int | None]] = {}
+        with self._reading() as cur:
+            # One indexed IN (...) query per batch; batches stay under SQLite's bound-parameter limit.
+            for i in range(0, len(keys), _IN_BATCH):
+                batch = keys[i : i + _IN_BATCH]
+                cur.execute(_SQL_PROCESSED_SOURCES_IN.format(params=",".join("?" * len(batch))), batch)
+                _keep_latest(latest, cur.fetchall())
         return {p: (mtime_ns, size) for p, (_t, mtime_ns, size) in latest.items()}
 
     def mark_in_progress(
         self,
         sha256: str,
-        source_path: Path,
+        source_path: StrPath,
         *,
         source_mtime_ns: int | None,
         source_size: int | None,
         force: bool = False,
     ) -> None:
-        now = time.time()
-        cur = self._conn.cursor()
+        sql = _SQL_MARK_IN_PROGRESS_FORCE if force else _SQL_MARK_IN_PROGRESS
+        self._exec_many([(sql, _in_progress_params(sha256, source_path, source_mtime_ns, source_size))])
+
+    def try_claim(
+        self,
+        sha256: str,
+        source_path: StrPath,
+        *,
+        source_mtime_ns: int | None,
+        source_size: int | None,
+        ttl_seconds: int,
+        force: bool = False,
+    ) -> bool:
+        params = _in_progress_params(sha256, source_path, source_mtime_ns, source_size)
         if force:
-            cur.execute(
-                """
-                INSERT INTO processed_files (sha256, status, started_at, source_path, source_mtime_ns, source_size)
-                VALUES (?, 'in_progress', ?, ?, ?, ?)
-                ON CONFLICT(sha256) DO UPDATE SET
-                  status='in_progress',
-                  started_at=excluded.started_at,
-                  source_path=excluded.source_path,
-                  source_mtime_ns=excluded.source_mtime_ns,
-                  source_size=excluded.source_size,
-                  error=NULL
-                """,
-                (sha256, now, str(source_path), source_mtime_ns, source_size),
-            )
-        else:
-            cur.execute(
-                """
-                INSERT INTO processed_files (sha256, status, started_at, source_path, source_mtime_ns, source_size)
-                VALUES (?, 'in_progress', ?, ?, ?, ?)
-                ON CONFLICT(sha256) DO NOTHING
-                """,
-                (sha256, now, str(source_path), source_mtime_ns, source_size),
-            )
-        self._conn.commit()
+            self._exec_many([(_SQL_MARK_IN_PROGRESS_FORCE, params)])
+            return True
+        # One statement decides and writes, so the check and the claim can't be split by another
+        # process (or another thread on this connection).
+        with self._lock:
+            self._cur.execute(_SQL_TRY_CLAIM, (*params, ttl_seconds))
+            return self._cur.rowcount == 1
 
     def mark_processed(
         self,
         sha256: str,
         *,
-        archive_path: Path | None,
-        topic_file: Path | None,
+        archive_path: StrPath | None,
+        topic_file: StrPath | None,
         codex_status: str | None,
-        source_path: Path | None = None,
+        source_path: StrPath | None = None,
         source_mtime_ns: int | None = None,
         source_size: int | None = None,
     ) -> None:
-        cur = self._conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO processed_files (
-              sha256, status, started_at, processed_at, source_path, source_mtime_ns, source_size, archive_path, topic_file, codex_status, error
-            )
-            VALUES (?, 'processed', NULL, ?, ?, ?, ?, ?, ?, ?, NULL)
-            ON CONFLICT(sha256) DO UPDATE SET
-              status='processed',
-              processed_at=excluded.processed_at,
-              source_path=COALESCE(excluded.source_path, source_path),
-              source_mtime_ns=COALESCE(excluded.source_mtime_ns, source_mtime_ns),
-              source_size=COALESCE(excluded.source_size, source_size),
-              archive_path=excluded.archive_path,
-              topic_file=excluded.topic_file,
-              codex_status=excluded.codex_status,
-              error=NULL
-            """,
-            (
-                sha256,
-                time.time(),
-                str(source_path) if source_path else None,
-                source_mtime_ns,
-                source_size,
-                str(archive_path) if archive_path else None,
-                str(topic_file) if topic_file else None,
-                codex_status,
-            ),
+        params = _processed_params(
+            sha256,
+            time.time(),
+            archive_path=archive_path,
+            topic_file=topic_file,
+            codex_status=codex_status,
+            source_path=source_path,
+            source_mtime_ns=source_mtime_ns,
+            source_size=source_size,
         )
-        self._conn.commit()
+        self._exec_many([(_SQL_MARK_PROCESSED, params)])
 
-    def mark_failed(self, sha256: str, error: str) -> None:
-        cur = self._conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO processed_files (sha256, status, started_at, processed_at, error)
-            VALUES (?, 'failed', NULL, ?, ?)
-            ON CONFLICT(sha256) DO UPDATE SET
-              status='failed',
-              processed_at=excluded.processed_at,
-              error=excluded.error
-            """,
-            (sha256, time.time(), error),
+    def record_completion(
+        self,
+        sha256: str,
+        source_path: StrPath,
+        *,
+        source_mtime_ns: int | None,
+        source_size: int | None,
+        archive_path: StrPath | None,
+        topic_file: StrPath | None,
+        codex_status: str | None,
+    ) -> None:
+        now = time.time()
+        self._exec_many(
+            [
+                (
+                    _SQL_MARK_IN_PROGRESS_FORCE,
+                    _in_progress_params(sha256, source_path, source_mtime_ns, source_size, now=now),
+                ),
+                (
+                    _SQL_MARK_PROCESSED,
+                    _processed_params(
+                        sha256,
+                        now,
+                        archive_path=archive_path,
+                        topic_file=topic_file,
+                        codex_status=codex_status,
+                        source_path=source_path,
+                        source_mtime_ns=source_mtime_ns,
+                        source_size=source_size,
+                    ),
+                ),
+            ]
         )
-        self._conn.commit()
+
+    def mark_many_processed(self, marks: Iterable[ProcessedMark]) -> None:
+        now = time.time()
+        rows = [
+            _processed_params(
+                m.sha256,
+                now,
+                archive_path=m.archive_path,
+                topic_file=m.topic_file,
+                codex_status=m.codex_status,
+                source_path=m.source_path,
+                source_mtime_ns=m.source_mtime_ns,
+                source_size=m.source_size,
+            )
+            for m in marks
+        ]
+        if not rows:
+            return
+        # One prepared statement stepped over every row, inside one transaction (one commit/fsync).
+        with self.transaction():
+            self._cur.executemany(_SQL_MARK_PROCESSED, rows)
+
+    def mark_failed(self, sha256: str, error: str) -> None:
+        self._exec_many([(_SQL_MARK_FAILED, (sha256, time.time(), error))])
+
+    def _exec_many(self, statements: list[tuple[str, tuple[Any, ...]]]) -> None:
+        """Runs `(sql, params)` pairs as one unit; a lone statement just autocommits."""
+        with self._lock:
+            if len(statements) == 1:
+                sql, params = statements[0]
+                self._cur.execute(sql, params)
+                return
+            with self.transaction():
+                for sql, params in statements:
+                    self._cur.execute(sql, params)
 
     def allow_retry_in_progress(self, sha256: str, ttl_seconds: int) -> bool:
         rec = self.get(sha256)
@@ -548,9 +976,9 @@ class SqliteStateStore(StateStore):
         return (time.time() - rec.started_at) > ttl_seconds
 
     def stats(self) -> dict[str, int]:
-        cur = self._conn.cursor()
-        cur.execute("SELECT status, COUNT(*) as n FROM processed_files GROUP BY status")
-        out = {row["status"]: int(row["n"]) for row in cur.fetchall()}
+        with self._reading() as cur:
+            cur.execute(_SQL_STATS)
+            out = {row["status"]: int(row["n"]) for row in cur.fetchall()}
         out.setdefault("processed", 0)
         out.setdefault("failed", 0)
         out.setdefault("in_progress", 0)
@@ -5,14 +5,24 @@ from pathlib import Path
 
 
 def sha256_file(path: Path, *, chunk_size: int = 1024 * 1024) -> str:
-    h = hashlib.sha256()
+    """
+    Hex SHA-256 of the file's contents.
+
+    `chunk_size` only applies on Pythons without `hashlib.file_digest` (< 3.11); `file_digest`
+    picks its own buffer size.
+    """
     with path.open("rb") as f:
+        # Python 3.11+: file_digest reads straight into a reusable buffer instead of allocating a
+        # new bytes object per chunk.
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
         while True:
             chunk = f.read(chunk_size)
             if not chunk:
                 break
             h.update(chunk)
-    return h.hexdigest()
+        return h.hexdigest()
 
 
 def path_rel_to(base: Path, target: Path) -> str:
@@ -1,23 +1,22 @@
 from __future__ import annotations
 
 import logging
+import os
 import signal
 import time
 from pathlib import Path
+from typing import Iterable
 
 from voice2md.config import AppConfig
 from voice2md.pipeline import process_audio_file
 from voice2md.state import StateStore, open_state_store
-from voice2md.stable import StableFileTracker
+from voice2md.stable import StableFileTracker, StatSnapshot
 
 log = logging.getLogger(__name__)
 
 
-def _is_candidate(path: Path, allowed_exts: tuple[str, ...]) -> bool:
-    if not path.is_file():
-        return False
-
-    name = path.name
+def _is_candidate(name: str, allowed_exts: frozenset[str]) -> bool:
+    # Name checks only; the caller checks the entry type afterwards, and only for names that pass.
     if name.startswith("."):
         return False
     lowered = name.lower()
@@ -25,31 +24,59 @@ def _is_candidate(path: Path, allowed_exts: tuple[str, ...]) -> bool:
         return False
     if lowered.endswith((".tmp", ".part", ".partial")):
         return False
-    if path.suffix.lower() not in {e.lower() for e in allowed_exts}:
+    if os.path.splitext(lowered)[1] not in allowed_exts:
         return False
     return True
 
 
-def list_candidates(inbox_dir: Path, allowed_exts: tuple[str, ...]) -> list[Path]:
-    if not inbox_dir.exists():
-        return []
-    out: list[Path] = []
-    for path in inbox_dir.rglob("*"):
+def allowed_extension_set(allowed_exts: Iterable[str]) -> frozenset[str]:
+    return frozenset(e.lower() for e in allowed_exts)
+
+
+def scan_candidates(
+    inbox_dir: Path, allowed_exts: tuple[str, ...] | frozenset[str]
+) -> dict[Path, StatSnapshot]:
+    """
+    Walks `inbox_dir` once with `os.scandir` and returns each candidate with the stat taken during
+    the walk, so callers can filter and sort without statting again. Like `Path.rglob`, symlinked
+    directories are not descended into; symlinked files are followed.
+
+    A frozenset of extensions is taken as already built by `allowed_extension_set`.
+    """
+    allowed = allowed_exts if isinstance(allowed_exts, frozenset) else allowed_extension_set(allowed_exts)
+    out: dict[Path, StatSnapshot] = {}
+    pending = [os.fspath(inbox_dir)]
+    while pending:
         try:
-            if _is_candidate(path, allowed_exts):
-                out.append(path)
+            it = os.scandir(pending.pop())
         except OSError:
             continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                        continue
+                    if not _is_candidate(entry.name, allowed) or not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                out[Path(entry.path)] = StatSnapshot(size=st.st_size, mtime_ns=st.st_mtime_ns)
     return out
 
 
+def list_candidates(inbox_dir: Path, allowed_exts: tuple[str, ...]) -> list[Path]:
+    return list(scan_candidates(inbox_dir, allowed_exts))
+
+
 class Watcher:
     def __init__(self, cfg: AppConfig) -> None:
         self._cfg = cfg
         self._stop = False
         self._state: StateStore = open_state_store(path=cfg.state.path, backend=cfg.state.backend)
-        self._processed_sources = self._state.processed_source_snapshots()
         self._stable = StableFileTracker(stable_seconds=cfg.processing.stable_seconds)
+        self._allowed_exts = allowed_extension_set(cfg.processing.allowed_extensions)
 
     def close(self) -> None:
         self._state.close()
@@ -85,38 +112,31 @@ class Watcher:
                 log.warning("Inbox directory does not exist: %s", inbox)
             return
 
-        def scan_candidates() -> list[Path]:
-            candidates = list_candidates(inbox, allowed)
-            if self._processed_sources:
-                filtered: list[Path] = []
-                for path in candidates:
-                    key = str(path)
-                    snap = self._processed_sources.get(key)
-                    if snap is None:
-                        filtered.append(path)
-                        continue
-                    try:
-                        st = path.stat()
-                    except FileNotFoundError:
-                        continue
-                    mtime_ns, size = snap
-                    if mtime_ns is None or size is None:
-                        continue
-                    if int(st.st_mtime_ns) == int(mtime_ns) and int(st.st_size) == int(size):
-                        continue
-                    self._processed_sources.pop(key, None)
-                    filtered.append(path)
-                candidates = filtered
+        def fresh_candidates() -> dict[Path, StatSnapshot]:
+            candidates = scan_candidates(inbox, self._allowed_exts)
+            if not candidates:
+                return candidates
+            # One batched lookup for the whole scan instead of keeping every processed source in memory.
+            processed = self._state.processed_source_snapshots_for(candidates)
+            for path, snap in list(candidates.items()):
+                prior = processed.get(str(path))
+                if prior is None:
+                    continue
+                mtime_ns, size = prior
+                if mtime_ns is None or size is None:
+                    del candidates[path]
+                elif snap.mtime_ns == int(mtime_ns) and snap.size == int(size):
+                    del candidates[path]
             return candidates
 
-        candidates = scan_candidates()
+        candidates = fresh_candidates()
         if not candidates:
             if log_when_idle:
                 exts = ", ".join(allowed) if allowed else "(none)"
                 log.info("No candidate audio files found (extensions: %s)", exts)
             return
 
-        stable = self._stable.observe(candidates)
+        stable = self._stable.observe(candidates, candidates)
         if not stable and wait_for_stable and self._cfg.processing.stable_seconds > 0:
             if log_when_idle:
                 log.info(
@@ -128,22 +148,18 @@ class Watcher:
             while not stable and time.monotonic() < deadline and not self._stop:
                 remaining = deadline - time.monotonic()
                 time.sleep(min(1.0, max(0.0, remaining)))
-                candidates = scan_candidates()
+                candidates = fresh_candidates()
                 if not candidates:
                     break
-                stable = self._stable.observe(candidates)
+                stable = self._stable.observe(candidates, candidates)
 
         if not stable:
             if log_when_idle:
                 log.info("No stable files yet (need unchanged for %ss)", self._cfg.processing.stable_seconds)
             return
-        def _mtime_or_zero(p: Path) -> float:
-            try:
-                return p.stat().st_mtime
-            except FileNotFoundError:
-                return 0.0
 
-        stable.sort(key=_mtime_or_zero)
+        # Oldest first, using the mtimes captured by the scan.
+        stable.sort(key=lambda p: candidates[p].mtime_ns)
 
         for path in stable:
             try:
@@ -155,11 +171,6 @@ class Watcher:
                         outcome.topic_file,
                         outcome.codex_status,
                     )
-                    try:
-                        st = path.stat()
-                        self._processed_sources[str(path)] = (int(st.st_mtime_ns), int(st.st_size))
-                    except FileNotFoundError:
-                        pass
             except Exception:
                 log.exception("Failed processing: %s", path)
             finally:
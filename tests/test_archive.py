@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import sys
+from pathlib import Path as _Path
+
+_SRC = str(_Path(__file__).resolve().parents[1] / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+from voice2md import archive
+from voice2md.archive import ensure_archived_copy
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+
+class EnsureArchivedCopyTests(unittest.TestCase):
+    @unittest.skipIf(fcntl is None, "needs fcntl")
+    def test_failed_clone_removes_dest_then_copies(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            src = Path(td) / "a.m4a"
+            src.write_bytes(b"audio bytes")
+            os.utime(src, ns=(1_000_000_000, 1_500_000_000))
+            dest = Path(td) / "archive" / "a.m4a"
+            real_copy2 = shutil.copy2
+            seen: list[bool] = []
+
+            def copy2(s, d):
+                # The failed clone must not leave its empty destination behind.
+                seen.append(Path(d).exists())
+                return real_copy2(s, d)
+
+            with mock.patch.object(archive.sys, "platform", "linux"), mock.patch.object(
+                fcntl, "ioctl", side_effect=OSError("EOPNOTSUPP")
+            ) as ioctl, mock.patch.object(archive.shutil, "copy2", side_effect=copy2) as copy:
+                self.assertEqual(ensure_archived_copy(source_path=src, dest_path=dest), dest)
+            ioctl.assert_called_once()
+            copy.assert_called_once_with(src, dest)
+            self.assertEqual(seen, [False])
+            self.assertEqual(dest.read_bytes(), b"audio bytes")
+            self.assertEqual(dest.stat().st_mtime_ns, src.stat().st_mtime_ns)
+
+    def test_successful_clone_skips_copy(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            src = Path(td) / "a.m4a"
+            src.write_bytes(b"audio bytes")
+            dest = Path(td) / "archive" / "a.m4a"
+            with mock.patch.object(archive, "_try_clone", return_value=True) as clone, mock.patch.object(
+                archive.shutil, "copy2"
+            ) as copy:
+                self.assertEqual(ensure_archived_copy(source_path=src, dest_path=dest), dest)
+            clone.assert_called_once_with(src, dest)
+            copy.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,9 +3,11 @@ import unittest
 import sys
 from pathlib import Path as _Path
 
-sys.path.insert(0, str(_Path(__file__).resolve().parents[1] / "src"))
+_SRC = str(_Path(__file__).resolve().parents[1] / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
 
-from voice2md.cli import _normalize_argv, build_parser
+from voice2md.cli import _fast_parse, _normalize_argv, build_parser, build_parser_for
 
 
 class CliArgTests(unittest.TestCase):
@@ -23,6 +25,28 @@ class CliArgTests(unittest.TestCase):
         args = parser.parse_args(_normalize_argv(["watch", "--once", "--verbose"]))
         self.assertTrue(args.verbose)
 
+    def test_single_subcommand_parser_matches_full_parser(self) -> None:
+        argv = _normalize_argv(["process", "a.m4a", "--force", "-v"])
+        full = build_parser().parse_args(argv)
+        single = build_parser_for("process").parse_args(argv)
+        self.assertIs(build_parser_for("process"), build_parser_for("process"))
+        self.assertEqual(vars(single), vars(full))
+
+    def test_fast_parse_matches_argparse(self) -> None:
+        for argv in (
+            ["watch", "--once", "--config", "/tmp/voice2md_config.yaml"],
+            ["-v", "process", "a.m4a", "--force"],
+            ["--config=/tmp/c.yaml", "status"],
+            ["rerun-codex", "Topics/Spin.md"],
+        ):
+            fast = _fast_parse(argv)
+            self.assertIsNotNone(fast, argv)
+            self.assertEqual(vars(fast), vars(build_parser().parse_args(_normalize_argv(argv))))
+
+    def test_fast_parse_defers_to_argparse(self) -> None:
+        for argv in ([], ["-h"], ["watch", "--help"], ["process"], ["status", "extra"], ["watch", "--onc"]):
+            self.assertIsNone(_fast_parse(argv), argv)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,11 +1,14 @@
 import unittest
+from pathlib import Path
 
 import sys
 from pathlib import Path as _Path
 
-sys.path.insert(0, str(_Path(__file__).resolve().parents[1] / "src"))
+_SRC = str(_Path(__file__).resolve().parents[1] / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
 
-from voice2md.codex_runner import _inject_reasoning_effort, _inject_web_search
+from voice2md.codex_runner import _inject_web_search, _prepare_codex_argv
 
 
 class CodexRunnerArgTests(unittest.TestCase):
@@ -19,12 +22,37 @@ class CodexRunnerArgTests(unittest.TestCase):
         out = _inject_web_search(cmd, True)
         self.assertEqual(out, cmd)
 
-    def test_inject_reasoning_effort_quotes_value(self) -> None:
+    def test_prepare_codex_argv_quotes_reasoning_effort(self) -> None:
         cmd = ["codex", "exec", "-"]
-        out = _inject_reasoning_effort(cmd, "xhigh")
+        out = _prepare_codex_argv(cmd, output_path=Path("/tmp/out.txt"), model="", reasoning_effort="xhigh")
         joined = " ".join(out)
         self.assertIn('model_reasoning_effort="xhigh"', joined)
 
+    def test_prepare_argv_inserts_before_prompt_dash(self) -> None:
+        cmd = ["codex", "exec", "--sandbox", "read-only", "-"]
+        out = _prepare_codex_argv(cmd, output_path=Path("/tmp/out.txt"), model="gpt-5", reasoning_effort="low")
+        self.assertEqual(
+            out,
+            [
+                "codex",
+                "exec",
+                "--sandbox",
+                "read-only",
+                "--output-last-message",
+                "/tmp/out.txt",
+                "--model",
+                "gpt-5",
+                "-c",
+                'model_reasoning_effort="low"',
+                "-",
+            ],
+        )
+
+    def test_prepare_argv_respects_user_flags(self) -> None:
+        cmd = ["codex", "exec", "-o", "/tmp/mine.txt", "-m", "o3", "-"]
+        out = _prepare_codex_argv(cmd, output_path=Path("/tmp/out.txt"), model="gpt-5", reasoning_effort="")
+        self.assertEqual(out, cmd)
+
 
 if __name__ == "__main__":
     unittest.main()
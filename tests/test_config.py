@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import sys
+from pathlib import Path as _Path
+
+_SRC = str(_Path(__file__).resolve().parents[1] / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+from unittest import mock
+
+from voice2md.config import ConfigError, _load_yaml, load_config
+
+
+class ConfigTests(unittest.TestCase):
+    def test_reuses_parsed_config_until_file_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "config.yaml"
+            path.write_text("routing:\n  infer_topic_max_words: 3\n", encoding="utf-8")
+
+            first = load_config(path)
+            self.assertIs(load_config(path), first)
+            self.assertEqual(first.routing.infer_topic_max_words, 3)
+
+            path.write_text("routing:\n  infer_topic_max_words: 12\n", encoding="utf-8")
+            st = path.stat()
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+            second = load_config(path)
+            self.assertIsNot(second, first)
+            self.assertEqual(second.routing.infer_topic_max_words, 12)
+
+    def test_blank_config_uses_defaults(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "config.yaml"
+            path.write_text("\n  \n", encoding="utf-8")
+            cfg = load_config(path)
+            self.assertEqual(cfg.processing.stable_seconds, 10)
+            self.assertEqual(cfg.transcription.engine, "whisper_cpp")
+
+    def test_json_cache_tracks_yaml_edits(self) -> None:
+        with tempfile.TemporaryDirectory() as td, mock.patch.dict(os.environ, {"VOICE2MD_CONFIG_CACHE": "1"}):
+            path = Path(td) / "config.yaml"
+            path.write_text("routing:\n  infer_topic_max_words: 3\n", encoding="utf-8")
+            self.assertEqual(_load_yaml(path), {"routing": {"infer_topic_max_words": 3}})
+            self.assertTrue((Path(td) / "config.yaml.jsoncache").exists())
+            self.assertEqual(_load_yaml(path), {"routing": {"infer_topic_max_words": 3}})
+
+            path.write_text("routing:\n  infer_topic_max_words: 12\n", encoding="utf-8")
+            self.assertEqual(_load_yaml(path), {"routing": {"infer_topic_max_words": 12}})
+
+    def test_missing_config_raises(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            with self.assertRaises(ConfigError):
+                load_config(Path(td) / "missing.yaml")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import sys
+from pathlib import Path as _Path
+
+_SRC = str(_Path(__file__).resolve().parents[1] / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+from voice2md import markdown
+from voice2md.markdown import append_block, extract_context, extract_latest_sections
+
+
+def _notebook(sections: int) -> str:
+    parts = ["# Topic\n\n"]
+    for i in range(sections):
+        kind = "Voice Dump" if i % 3 != 2 else "AI Commentary"
+        body = f"Body {i} ünïcode " + "x" * (i * 7 % 90)
+        parts.append(f"## {kind} — 2025-01-{i % 28 + 1:02d} 10:00\n\n{body}\n\n---\n\n")
+    return "".join(parts)
+
+
+class ExtractContextTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.topic_file = Path(self._tmp.name) / "Topic.md"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_tail_window_matches_full_parse(self) -> None:
+        self.topic_file.write_text(_notebook(60), encoding="utf-8")
+        cases = [
+            dict(voice_dumps=2, ai_commentaries=1, max_chars=12000),
+            dict(voice_dumps=40, ai_commentaries=20, max_chars=100000),
+            dict(voice_dumps=3, ai_commentaries=0, max_chars=300, skip_latest_voice_dump=True),
+            dict(voice_dumps=0, ai_commentaries=5, max_chars=12000),
+        ]
+        for kwargs in cases:
+            with self.subTest(**kwargs):
+                with mock.patch.object(markdown, "_TAIL_WINDOW_BYTES", 1 << 30):
+                    full = extract_context(self.topic_file, **kwargs)
+                with mock.patch.object(markdown, "_TAIL_WINDOW_BYTES", 64):
+                    tail = extract_context(self.topic_file, **kwargs)
+                self.assertEqual(tail, full)
+                self.assertTrue(full.markdown)
+
+    def test_crlf_notebook(self) -> None:
+        self.topic_file.write_bytes(_notebook(12).replace("\n", "\r\n").encode("utf-8"))
+        with mock.patch.object(markdown, "_TAIL_WINDOW_BYTES", 64):
+            tail = extract_context(self.topic_file, voice_dumps=2, ai_commentaries=1, max_chars=12000)
+        with mock.patch.object(markdown, "_TAIL_WINDOW_BYTES", 1 << 30):
+            full = extract_context(self.topic_file, voice_dumps=2, ai_commentaries=1, max_chars=12000)
+        self.assertEqual(tail, full)
+        self.assertNotIn("\r", tail.markdown)
+
+    def test_missing_file(self) -> None:
+        self.assertEqual(extract_context(self.topic_file, voice_dumps=1, ai_commentaries=1, max_chars=100).markdown, "")
+
+    def test_latest_sections_see_appends(self) -> None:
+        self.topic_file.write_text(_notebook(3), encoding="utf-8")
+        self.assertEqual(extract_latest_sections(self.topic_file).last_section_kind, "AI Commentary")
+        with self.topic_file.open("a", encoding="utf-8") as f:
+            f.write("## Voice Dump — 2025-02-01 10:00\n\nNew\n")
+        latest = extract_latest_sections(self.topic_file)
+        self.assertEqual(latest.last_section_kind, "Voice Dump")
+        self.assertTrue(latest.latest_voice_dump.endswith("New"))
+
+
+class AppendBlockTests(unittest.TestCase):
+    def test_separators_and_missing_newline(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            topic_file = Path(td) / "Topic.md"
+            append_block(topic_file, "a", include_separator=True)
+            with topic_file.open("a", encoding="utf-8") as f:
+                f.write("b")
+            append_block(topic_file, "c\n\n", include_separator=True)
+            append_block(topic_file, "d", include_separator=False)
+            self.assertEqual(topic_file.read_text(encoding="utf-8"), "a\nb\n\n---\n\nc\nd\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import sys
+from pathlib import Path as _Path
+
+_SRC = str(_Path(__file__).resolve().parents[1] / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+from voice2md.pipeline import _is_source_processed
+from voice2md.state import open_state_store
+
+
+class SourceProcessedTests(unittest.TestCase):
+    def test_falls_back_to_resolved_path_rows(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            real = Path(td) / "real"
+            real.mkdir()
+            link = Path(td) / "inbox"
+            link.symlink_to(real, target_is_directory=True)
+            s = open_state_store(path=Path(td) / "state.json", backend="json")
+            try:
+                # A row keyed by the resolved path, as earlier versions wrote it.
+                s.mark_processed(
+                    "sha",
+                    archive_path=None,
+                    topic_file=None,
+                    codex_status="ok",
+                    source_path=os.path.realpath(real / "a.m4a"),
+                    source_mtime_ns=1,
+                    source_size=2,
+                )
+                key = os.path.abspath(link / "a.m4a")
+                self.assertTrue(_is_source_processed(s, key, source_mtime_ns=1, source_size=2))
+                self.assertFalse(_is_source_processed(s, key, source_mtime_ns=1, source_size=3))
+                other = os.path.abspath(link / "b.m4a")
+                self.assertFalse(_is_source_processed(s, other, source_mtime_ns=1, source_size=2))
+            finally:
+                s.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,9 +4,11 @@ from pathlib import Path
 import sys
 from pathlib import Path as _Path
 
-sys.path.insert(0, str(_Path(__file__).resolve().parents[1] / "src"))
+_SRC = str(_Path(__file__).resolve().parents[1] / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
 
-from voice2md.router import decide_route
+from voice2md.router import decide_route, filename_hints, infer_mode, tokens_from_transcript
 
 
 class RouterTests(unittest.TestCase):
@@ -28,6 +30,42 @@ class RouterTests(unittest.TestCase):
         self.assertEqual(decision.topic_source, "inferred")
         self.assertEqual(decision.mode_source, "inferred")
 
+    def test_transcript_topic_line(self) -> None:
+        audio = Path("random_recording.m4a")
+        decision = decide_route(audio_path=audio, transcript="TOPIC: Spin Echo\nThis is about something else.")
+        self.assertEqual(decision.topic, "Spin Echo")
+        self.assertEqual(decision.topic_source, "transcript")
+
+    def test_transcript_topic_line_with_unicode_indent(self) -> None:
+        transcript = "\u00a0TOPIC:\u2003Spin Echo\u00a0\nRelaxation content about relaxation."
+        self.assertEqual(tokens_from_transcript(transcript), "Spin Echo")
+        decision = decide_route(audio_path=Path("random_recording.m4a"), transcript=transcript)
+        self.assertEqual(decision.topic, "Spin Echo")
+        self.assertEqual(decision.topic_source, "transcript")
+
+    def test_transcript_topic_only_read_from_head(self) -> None:
+        filler = "word " * 500
+        self.assertIsNone(tokens_from_transcript(f"{filler}\nTOPIC: Too Late"))
+        straddling = f"{'x' * 2040}\nTOPIC: Spin Echo Relaxation\nbody"
+        self.assertEqual(tokens_from_transcript(straddling), "Spin Echo Relaxation")
+
+    def test_filename_hints_forms(self) -> None:
+        self.assertEqual(filename_hints(Path("2025-12-29 - Spin notes.m4a")), "Spin notes")
+        self.assertEqual(filename_hints(Path("rec 2025-12-29: Spin.m4a")), "Spin")
+        self.assertIsNone(filename_hints(Path("2025-12-29.m4a")))
+        self.assertIsNone(filename_hints(Path("2025-12-291 notes.m4a")))
+        self.assertEqual(filename_hints("/inbox/2025-12-29 Spin notes.m4a"), "Spin notes")
+        self.assertEqual(
+            decide_route(audio_path="2025-12-29 Spin notes.m4a", transcript="x").topic, "Spin notes"
+        )
+
+    def test_infer_mode_priority(self) -> None:
+        self.assertEqual(infer_mode("I want to publish this, and it obviously works."), "prep for sharing")
+        self.assertEqual(infer_mode("Therefore the mechanism holds."), "claims")
+        self.assertEqual(infer_mode("Lets  define the variables first."), "model-forming")
+        self.assertEqual(infer_mode("Just some remodelling thoughts."), "brainstorming")
+        self.assertEqual(infer_mode("TOPIC: blog\nnothing much"), "brainstorming")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,7 +4,9 @@ from pathlib import Path
 import sys
 from pathlib import Path as _Path
 
-sys.path.insert(0, str(_Path(__file__).resolve().parents[1] / "src"))
+_SRC = str(_Path(__file__).resolve().parents[1] / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
 
 from voice2md.stable import StableFileTracker, StatSnapshot
 
@@ -57,6 +59,21 @@ class StableTrackerTests(unittest.TestCase):
         now = 11.2
         self.assertEqual(t.observe([p]), [p])
 
+    def test_uses_supplied_snapshots(self) -> None:
+        p = Path("/tmp/a.m4a")
+        now = 0.0
+
+        def clock() -> float:
+            return now
+
+        def stat_provider(path: Path) -> StatSnapshot:
+            raise AssertionError("should not stat when a snapshot is supplied")
+
+        t = StableFileTracker(stable_seconds=5, stat_provider=stat_provider, clock=clock)
+        self.assertEqual(t.observe([p], {p: StatSnapshot(size=1, mtime_ns=1)}), [])
+        now = 5.5
+        self.assertEqual(t.observe([p], {p: StatSnapshot(size=1, mtime_ns=1)}), [p])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,54 +1,278 @@
+import sqlite3
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 
 import sys
 from pathlib import Path as _Path
 
-sys.path.insert(0, str(_Path(__file__).resolve().parents[1] / "src"))
+_SRC = str(_Path(__file__).resolve().parents[1] / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
 
-from voice2md.state import open_state_store
+from voice2md import state as state_module
+from voice2md.state import ProcessedMark, SqliteStateStore, open_state_store
 
 
 class StateStoreTests(unittest.TestCase):
+    # Tests that only need keys nobody else uses share one store per backend, so the class pays
+    # for file creation and schema setup once. Tests that reopen, roll back or race get their own.
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.stores = {
+            backend: open_state_store(path=Path(cls._tmp.name) / filename, backend=backend)
+            for backend, filename in (("json", "state.json"), ("sqlite", "state.sqlite3"))
+        }
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        for s in cls.stores.values():
+            s.close()
+        cls._tmp.cleanup()
+
     def test_idempotency_and_status(self) -> None:
+        for backend, s in self.stores.items():
+            with self.subTest(backend=backend):
+                sha = f"abc123_{backend}"
+                source = Path("/tmp/a.m4a")
+                mtime_ns = 123
+                size = 456
+
+                self.assertFalse(s.is_processed(sha))
+
+                s.mark_in_progress(
+                    sha,
+                    source,
+                    source_mtime_ns=mtime_ns,
+                    source_size=size,
+                    force=True,
+                )
+                self.assertFalse(s.is_processed(sha))
+                self.assertFalse(s.allow_retry_in_progress(sha, ttl_seconds=3600))
+
+                s.mark_processed(
+                    sha,
+                    archive_path=Path("/tmp/archive/a.m4a"),
+                    topic_file=Path("/tmp/topic.md"),
+                    codex_status="ok",
+                    source_path=source,
+                    source_mtime_ns=mtime_ns,
+                    source_size=size,
+                )
+                self.assertTrue(s.is_processed(sha))
+                self.assertTrue(s.is_source_processed(source, source_mtime_ns=mtime_ns, source_size=size))
+                self.assertFalse(s.allow_retry_in_progress(sha, ttl_seconds=0))
+                self.assertEqual(
+                    s.processed_source_snapshots_for([source, Path("/tmp/other.m4a")]),
+                    {str(source): (mtime_ns, size)},
+                )
+
+    def test_record_completion(self) -> None:
+        for backend, s in self.stores.items():
+            with self.subTest(backend=backend):
+                source = Path("/tmp/b.m4a")
+                in_progress = s.stats()["in_progress"]
+                s.record_completion(
+                    "done",
+                    source,
+                    source_mtime_ns=7,
+                    source_size=8,
+                    archive_path=None,
+                    topic_file=Path("/tmp/topic.md"),
+                    codex_status="ok",
+                )
+                rec = s.get("done")
+                self.assertEqual(rec.status, "processed")
+                self.assertEqual(rec.source_path, str(source))
+                self.assertTrue(s.is_source_processed(source, source_mtime_ns=7, source_size=8))
+                self.assertEqual(s.stats()["in_progress"], in_progress)
+
+    def test_try_claim(self) -> None:
+        for backend, s in self.stores.items():
+            with self.subTest(backend=backend):
+                source = Path("/tmp/c.m4a")
+
+                def claim(sha: str, *, ttl: int = 3600, force: bool = False) -> bool:
+                    return s.try_claim(
+                        sha, source, source_mtime_ns=1, source_size=2, ttl_seconds=ttl, force=force
+                    )
+
+                self.assertTrue(claim("claim"))
+                self.assertFalse(claim("claim"))
+                self.assertTrue(claim("claim", ttl=-1))
+                self.assertEqual(s.get("claim").status, "in_progress")
+
+                s.mark_failed("claim", "boom")
+                self.assertTrue(claim("claim"))
+
+                s.mark_processed("claim", archive_path=None, topic_file=None, codex_status="ok")
+                self.assertFalse(claim("claim", ttl=-1))
+                self.assertTrue(s.is_processed("claim"))
+                self.assertTrue(claim("claim", force=True))
+                self.assertEqual(s.get("claim").status, "in_progress")
+
+    def test_mark_many_processed(self) -> None:
+        for backend, s in self.stores.items():
+            with self.subTest(backend=backend):
+                processed = s.stats()["processed"]
+                s.mark_many_processed(
+                    ProcessedMark(
+                        sha256=f"m{i}",
+                        archive_path=None,
+                        topic_file=Path("/tmp/topic.md"),
+                        codex_status="ok",
+                        source_path=Path(f"/in/{i}.m4a"),
+                        source_mtime_ns=i,
+                        source_size=10 + i,
+                    )
+                    for i in range(3)
+                )
+                s.mark_many_processed([])
+                self.assertEqual(s.stats()["processed"], processed + 3)
+                self.assertEqual(s.get("m1").topic_file, "/tmp/topic.md")
+                self.assertEqual(s.processed_source_snapshots_for(["/in/2.m4a"]), {"/in/2.m4a": (2, 12)})
+
+    def test_mark_many_processed_bulk_catch_up(self) -> None:
+        marks = [
+            ProcessedMark(
+                sha256=f"bulk{i}",
+                archive_path=Path(f"/vault/audio/{i}.m4a"),
+                topic_file=Path("/vault/topics/Catch up.md"),
+                codex_status="skipped",
+            )
+            for i in range(1000)
+        ]
+        for backend, s in self.stores.items():
+            with self.subTest(backend=backend):
+                statements: list[str] = []
+                if backend == "sqlite":
+                    s._conn.set_trace_callback(statements.append)
+                try:
+                    s.mark_many_processed(marks)
+                finally:
+                    if backend == "sqlite":
+                        s._conn.set_trace_callback(None)
+                self.assertTrue(all(s.is_processed(m.sha256) for m in marks))
+                if backend == "sqlite":
+                    self.assertEqual(sum(1 for sql in statements if sql.strip().upper() == "COMMIT"), 1)
+
+    def test_sqlite_reads_do_not_wait_for_open_write_transaction(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            s = open_state_store(path=Path(td) / "state.sqlite3", backend="sqlite")
+            try:
+                s.mark_processed("committed", archive_path=None, topic_file=None, codex_status="ok")
+                seen: dict[str, object] = {}
+
+                def reader() -> None:
+                    seen["committed"] = s.is_processed("committed")
+                    seen["pending"] = s.get("pending")
+                    seen["stats"] = [s.stats() for _ in range(8)][-1]
+
+                with s.transaction():
+                    s.mark_failed("pending", "boom")
+                    self.assertEqual(s.get("pending").status, "failed")
+                    threads = [threading.Thread(target=reader) for _ in range(4)]
+                    for t in threads:
+                        t.start()
+                    for t in threads:
+                        t.join(timeout=5)
+                        self.assertFalse(t.is_alive())
+
+                self.assertTrue(seen["committed"])
+                self.assertIsNone(seen["pending"])
+                self.assertEqual(seen["stats"]["failed"], 0)
+                self.assertEqual(s.get("pending").status, "failed")
+            finally:
+                s.close()
+
+    def test_sqlite_reader_pool_is_bounded_and_closed(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            s = open_state_store(path=Path(td) / "state.sqlite3", backend="sqlite")
+            held = [s._reading() for _ in range(state_module._MAX_IDLE_READERS + 2)]
+            curs = [ctx.__enter__() for ctx in held]
+            for ctx in held:
+                ctx.__exit__(None, None, None)
+            self.assertEqual(len(s._idle_readers), state_module._MAX_IDLE_READERS)
+
+            # A reader checked out across close() is closed when handed back, not re-pooled.
+            with s._reading() as cur:
+                s.close()
+            for c in (cur, *curs):
+                with self.assertRaises(sqlite3.ProgrammingError):
+                    c.execute("SELECT 1")
+            with self.assertRaises(sqlite3.ProgrammingError):
+                s.get("anything")
+            s.close()
+
+    def test_sqlite_in_memory_store(self) -> None:
+        s = SqliteStateStore(Path(":memory:"))
+        try:
+            s.mark_failed("a", "boom")
+            self.assertEqual(s.stats()["failed"], 1)
+        finally:
+            s.close()
+
+    def test_transaction_commits_and_rolls_back(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             for backend, filename in (("json", "state.json"), ("sqlite", "state.sqlite3")):
                 path = Path(td) / filename
                 s = open_state_store(path=path, backend=backend)
                 try:
-                    sha = f"abc123_{backend}"
-                    source = Path("/tmp/a.m4a")
-                    mtime_ns = 123
-                    size = 456
-
-                    self.assertFalse(s.is_processed(sha))
-
-                    s.mark_in_progress(
-                        sha,
-                        source,
-                        source_mtime_ns=mtime_ns,
-                        source_size=size,
-                        force=True,
-                    )
-                    self.assertFalse(s.is_processed(sha))
-                    self.assertFalse(s.allow_retry_in_progress(sha, ttl_seconds=3600))
+                    with s.transaction():
+                        with s.transaction():
+                            s.mark_failed(f"a_{backend}", "boom")
+                        s.mark_processed(
+                            f"b_{backend}", archive_path=None, topic_file=None, codex_status="ok"
+                        )
+                    reopened = open_state_store(path=path, backend=backend)
+                    try:
+                        self.assertEqual(reopened.stats()["failed"], 1)
+                        self.assertTrue(reopened.is_processed(f"b_{backend}"))
+                    finally:
+                        reopened.close()
 
-                    s.mark_processed(
-                        sha,
-                        archive_path=Path("/tmp/archive/a.m4a"),
-                        topic_file=Path("/tmp/topic.md"),
-                        codex_status="ok",
-                        source_path=source,
-                        source_mtime_ns=mtime_ns,
-                        source_size=size,
-                    )
-                    self.assertTrue(s.is_processed(sha))
-                    self.assertTrue(s.is_source_processed(source, source_mtime_ns=mtime_ns, source_size=size))
-                    self.assertFalse(s.allow_retry_in_progress(sha, ttl_seconds=0))
+                    if backend == "sqlite":
+                        with self.assertRaises(ValueError):
+                            with s.transaction():
+                                s.mark_failed("c", "boom")
+                                raise ValueError
+                        self.assertIsNone(s.get("c"))
                 finally:
                     s.close()
 
+    def test_sqlite_store_is_usable_from_other_threads(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            s = open_state_store(path=Path(td) / "state.sqlite3", backend="sqlite")
+            try:
+                errors: list[BaseException] = []
+
+                def worker(n: int) -> None:
+                    try:
+                        for i in range(20):
+                            sha = f"t{n}_{i}"
+                            with s.transaction():
+                                s.mark_in_progress(
+                                    sha, f"/in/{sha}.m4a", source_mtime_ns=1, source_size=2
+                                )
+                                s.mark_processed(
+                                    sha, archive_path=None, topic_file=None, codex_status="ok"
+                                )
+                            s.is_processed(sha)
+                    except BaseException as exc:
+                        errors.append(exc)
+
+                threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+                self.assertEqual(errors, [])
+                self.assertEqual(s.stats()["processed"], 80)
+            finally:
+                s.close()
+
 
 if __name__ == "__main__":
     unittest.main()
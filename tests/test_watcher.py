@@ -0,0 +1,39 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import sys
+from pathlib import Path as _Path
+
+_SRC = str(_Path(__file__).resolve().parents[1] / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+from voice2md.watcher import scan_candidates
+
+
+class ScanCandidatesTests(unittest.TestCase):
+    def test_filters_names_and_captures_stat(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            (root / "sub").mkdir()
+            keep = [root / "a.m4a", root / "sub" / "B.MP3"]
+            skip = [root / ".hidden.m4a", root / "c.m4a.part", root / "notes.txt", root / ".syncthing.d.m4a.tmp"]
+            for p in keep + skip:
+                p.write_bytes(b"x" * 3)
+            (root / "dir.m4a").mkdir()
+
+            found = scan_candidates(root, (".m4a", ".mp3"))
+            self.assertEqual(set(found), set(keep))
+            st = os.stat(keep[0])
+            self.assertEqual(found[keep[0]].size, 3)
+            self.assertEqual(found[keep[0]].mtime_ns, st.st_mtime_ns)
+
+    def test_missing_inbox(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            self.assertEqual(scan_candidates(Path(td) / "nope", (".m4a",)), {})
+
+
+if __name__ == "__main__":
+    unittest.main()